@@ -2,10 +2,16 @@
 """Lightweight key press recorder tailored for a yearly “Wrapped” view."""
 
 import argparse
+import atexit
+import functools
 import json
 import os
 import platform
+import random
+import signal
 import sys
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -18,24 +24,176 @@ except ImportError:  # pragma: no cover
     )
     sys.exit(1)
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 from scripts.logger_health import append_debug, write_health_status
 from scripts.configuration import load_app_config
 from scripts.word_checker import WordChecker
 
 
+# The summary is rewritten at most every PERSIST_EVERY_EVENTS events or PERSIST_INTERVAL_S seconds;
+# a background autosave covers the idle tail once typing stops.
+PERSIST_EVERY_EVENTS = 200
+PERSIST_INTERVAL_S = 5.0
+# Raw events are buffered and flushed every LOG_FLUSH_EVERY_EVENTS events, after a long pause,
+# whenever the summary is saved, and by the autosave thread every LOG_FLUSH_INTERVAL_S seconds.
+LOG_FLUSH_EVERY_EVENTS = 64
+LOG_FLUSH_INTERVAL_S = 1.0
+LOG_BUFFER_BYTES = 65536
+# Upper bound on memoised key descriptions; a keyboard has far fewer distinct keys.
+KEY_CACHE_SIZE = 1024
+# Reservoir size for word_shapes; keeps each word's sample list (and every persist) bounded.
+WORD_SHAPE_SAMPLES = 32
+
+
+@functools.lru_cache(maxsize=1)
+def _device_meta():
+    # platform.processor() can shell out to uname, so look this up once per process.
+    return {
+        "platform": platform.system(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
 def _timestamp_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+@functools.lru_cache(maxsize=1)
+def _utc_second_prefix(second: int) -> str:
+    return datetime.fromtimestamp(second, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _utc_isoformat(wall_ns: int) -> str:
+    """Same text as datetime.isoformat() for UTC, reusing the formatted second between presses."""
+    second, remainder = divmod(wall_ns, 1_000_000_000)
+    micros = remainder // 1000
+    prefix = _utc_second_prefix(second)
+    if micros:
+        return f"{prefix}.{micros:06d}+00:00"
+    return f"{prefix}+00:00"
+
+
+def _dumps_line(payload) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _dumps_summary(payload) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _empty_summary():
+    # device_meta is filled in by _ensure_schema for new and loaded summaries alike.
+    return {
+        "total_events": 0,
+        "letters": 0,
+        "actions": 0,
+        "words": 0,
+        "rage_clicks": 0,
+        "long_pauses": 0,
+        "first_event": None,
+        "last_event": None,
+        "key_counts": {},
+        "daily_activity": {},
+        "daily_rage": {},
+        "daily_word_counts": {},
+        "key_pairs": {},
+        "key_press_lengths": {},
+        "interval_stats": {"count": 0, "total_ms": 0, "max_ms": 0, "min_ms": None},
+        "word_durations": {},
+        "device_meta": None,
+        "word_counts": {},
+        "word_pairs": {},
+        "word_shapes": {},
+        "typing_profile": {
+            "avg_interval": 0,
+            "avg_press_length": 0,
+            "wpm": 0,
+            "avg_word_shape_samples": 0,
+            "long_pause_rate": 0,
+        },
+        "word_accuracy": {"score": 0, "correct": 0, "incorrect": 0},
+        "speed_points": {
+            "earned": 0,
+            "sessions": 0,
+            "last_avg_interval": 0,
+            "last_accuracy_pct": 0,
+            "target_sessions": 0,
+        },
+    }
+
+
 class WrappedLogger:
+    __slots__ = (
+        "log_path",
+        "summary_path",
+        "log_file",
+        "unflushed_events",
+        "last_press_ns",
+        "last_key",
+        "last_logged_key",
+        "rage_streak",
+        "word_buffer",
+        "previous_word",
+        "current_day_label",
+        "word_start",
+        "word_last",
+        "pending_keys",
+        "key_cache",
+        "letter_durations",
+        "letter_intervals",
+        "unsaved_events",
+        "last_persist",
+        "lock",
+        "stopped",
+        "stop_event",
+        "summary",
+        "total_press_ms",
+        "total_press_count",
+        "word_shape_samples",
+        "interval_stats",
+        "key_press_lengths",
+        "key_pairs",
+        "key_counts",
+        "daily_activity",
+        "daily_rage",
+        "word_pairs",
+        "day_words_label",
+        "day_words",
+        "min_rage_interval_ms",
+        "log_mode",
+        "speed_baseline_interval",
+        "speed_interval_pct",
+        "speed_accuracy_pct",
+        "session_gap_ms",
+        "speed_target_sessions",
+        "accuracy_points",
+        "accuracy_target",
+        "word_checker",
+        "session_interval_total",
+        "session_interval_count",
+        "session_word_attempts",
+        "session_word_correct",
+    )
+
     def __init__(self, log_path: Path, summary_path: Path, min_rage_interval_ms=450, log_mode=False):
         self.log_path = log_path
         self.summary_path = summary_path
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
         self.summary_path.parent.mkdir(parents=True, exist_ok=True)
-        self.log_file = open(self.log_path, "a", encoding="utf-8")
+        self.log_file = open(self.log_path, "ab", buffering=LOG_BUFFER_BYTES)
+        self.unflushed_events = 0
 
-        self.last_press_time = None
+        # Press/release timing uses perf_counter_ns; wall-clock time is only used for event timestamps.
+        self.last_press_ns = None
         self.last_key = None
         self.last_logged_key = None
         self.rage_streak = 0
@@ -45,9 +203,20 @@ class WrappedLogger:
         self.word_start = None
         self.word_last = None
         self.pending_keys = {}
-        self.current_word_letter_events = []
+        self.key_cache = {}
+        # Per-letter hold and interval timings of the word being typed, as parallel lists.
+        self.letter_durations = []
+        self.letter_intervals = []
+        self.unsaved_events = 0
+        self.last_persist = None
+        # Listener callbacks, the autosave thread and shutdown all mutate the summary.
+        self.lock = threading.RLock()
+        self.stopped = False
+        self.stop_event = threading.Event()
         self.summary = self._load_existing_summary()
         self._ensure_schema()
+        self._bind_sections()
+        self._init_profile_totals()
         self.min_rage_interval_ms = min_rage_interval_ms
         self.log_mode = log_mode
         config = load_app_config()
@@ -74,91 +243,12 @@ class WrappedLogger:
 
     def _load_existing_summary(self):
         if not self.summary_path.exists():
-            return {
-                "total_events": 0,
-                "letters": 0,
-                "actions": 0,
-                "words": 0,
-                "rage_clicks": 0,
-                "long_pauses": 0,
-                "first_event": None,
-                "last_event": None,
-                "key_counts": {},
-                "daily_activity": {},
-                "daily_rage": {},
-                "daily_word_counts": {},
-                "key_pairs": {},
-                "key_press_lengths": {},
-                "interval_stats": {"count": 0, "total_ms": 0, "max_ms": 0, "min_ms": None},
-                "word_durations": {},
-                "device_meta": self._capture_device_meta(),
-                "word_counts": {},
-                "word_pairs": {},
-                "word_shapes": {},
-            "typing_profile": {
-                "avg_interval": 0,
-                "avg_press_length": 0,
-                "wpm": 0,
-                "avg_word_shape_samples": 0,
-                "long_pause_rate": 0,
-            },
-            "word_accuracy": {"score": 0, "correct": 0, "incorrect": 0},
-            "speed_points": {
-                "earned": 0,
-                "sessions": 0,
-                "last_avg_interval": 0,
-                "last_accuracy_pct": 0,
-                "target_sessions": 0,
-            },
-            "speed_points": {
-                "earned": 0,
-                "sessions": 0,
-                "last_avg_interval": 0,
-                "last_accuracy_pct": 0,
-                "target_sessions": 0,
-            },
-        }
-        with open(self.summary_path, "r", encoding="utf-8") as existing:
-            try:
-                return json.load(existing)
-            except json.JSONDecodeError:  # pragma: no cover
-                return {
-                    "total_events": 0,
-                    "letters": 0,
-                    "actions": 0,
-                    "words": 0,
-                    "rage_clicks": 0,
-                    "long_pauses": 0,
-                    "first_event": None,
-                    "last_event": None,
-                    "key_counts": {},
-                    "daily_activity": {},
-                    "daily_rage": {},
-                    "daily_word_counts": {},
-                    "key_pairs": {},
-                    "key_press_lengths": {},
-                    "interval_stats": {"count": 0, "total_ms": 0, "max_ms": 0, "min_ms": None},
-                    "word_durations": {},
-                    "device_meta": self._capture_device_meta(),
-                "word_counts": {},
-                "word_pairs": {},
-                "word_shapes": {},
-                "typing_profile": {
-                    "avg_interval": 0,
-                    "avg_press_length": 0,
-                    "wpm": 0,
-                    "avg_word_shape_samples": 0,
-                    "long_pause_rate": 0,
-                },
-                "word_accuracy": {"score": 0, "correct": 0, "incorrect": 0},
-                "speed_points": {
-                    "earned": 0,
-                    "sessions": 0,
-                    "last_avg_interval": 0,
-                    "last_accuracy_pct": 0,
-                    "target_sessions": 0,
-                },
-            }
+            return _empty_summary()
+        raw = self.summary_path.read_bytes()
+        try:
+            return orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except ValueError:  # pragma: no cover
+            return _empty_summary()
 
     def _ensure_schema(self):
         defaults = {
@@ -182,27 +272,54 @@ class WrappedLogger:
             self.summary.setdefault(key, value)
         self.summary["device_meta"] = self._capture_device_meta()
 
+    def _bind_sections(self):
+        # The per-event sections are never replaced after load, so hold them directly.
+        summary = self.summary
+        self.interval_stats = summary["interval_stats"]
+        for field, default in (("count", 0), ("total_ms", 0), ("max_ms", 0), ("min_ms", None)):
+            self.interval_stats.setdefault(field, default)
+        self.key_press_lengths = summary["key_press_lengths"]
+        self.key_pairs = summary["key_pairs"]
+        self.key_counts = summary.setdefault("key_counts", {})
+        self.daily_activity = summary.setdefault("daily_activity", {})
+        self.daily_rage = summary["daily_rage"]
+        self.word_pairs = summary.setdefault("word_pairs", {})
+        # The day's word-count map only changes at midnight; keep the current one at hand.
+        self.day_words_label = None
+        self.day_words = None
+
+    def _init_profile_totals(self):
+        self.total_press_ms = 0
+        self.total_press_count = 0
+        for entry in self.key_press_lengths.values():
+            self.total_press_ms += entry.get("total_ms", 0)
+            self.total_press_count += entry.get("count", 0)
+        shapes = self.summary.get("word_shapes", {})
+        for word, records in shapes.items():
+            if len(records) > WORD_SHAPE_SAMPLES:
+                # Summaries written before the cap kept every run; keep a uniform sample of them.
+                shapes[word] = random.sample(records, WORD_SHAPE_SAMPLES)
+        self.word_shape_samples = sum(len(values) for values in shapes.values())
+
     def _capture_device_meta(self):
-        return {
-            "platform": platform.system(),
-            "machine": platform.machine(),
-            "processor": platform.processor(),
-        }
+        return dict(_device_meta())
 
     def _write_event(self, event):
-        self.log_file.write(json.dumps(event, ensure_ascii=False) + "\n")
-        self.log_file.flush()
+        self.log_file.write(_dumps_line(event))
+        self.unflushed_events += 1
+        if self.unflushed_events >= LOG_FLUSH_EVERY_EVENTS or event["behaviors"].get("long_pause"):
+            self._flush_log()
         if self.log_mode:
             self._log_capture(event)
 
+    def _flush_log(self):
+        self.log_file.flush()
+        self.unflushed_events = 0
+
     def _record_interval(self, interval_ms):
         if interval_ms <= 0:
             return
-        stats = self.summary.setdefault("interval_stats", {})
-        stats.setdefault("count", 0)
-        stats.setdefault("total_ms", 0)
-        stats.setdefault("max_ms", 0)
-        stats.setdefault("min_ms", None)
+        stats = self.interval_stats
         stats["count"] += 1
         stats["total_ms"] += interval_ms
         stats["max_ms"] = max(stats["max_ms"], interval_ms)
@@ -213,62 +330,65 @@ class WrappedLogger:
     def _record_duration(self, key, duration_ms):
         if duration_ms is None:
             return
-        lengths = self.summary.setdefault(
-            "key_press_lengths",
-            {"count": 0, "total_ms": 0, "max_ms": 0, "min_ms": None},
-        )
-        key_stats = lengths.setdefault(key, {"count": 0, "total_ms": 0, "max_ms": 0, "min_ms": None})
+        key_stats = self.key_press_lengths.get(key)
+        if key_stats is None:
+            key_stats = {"count": 0, "total_ms": 0, "max_ms": 0, "min_ms": None}
+            self.key_press_lengths[key] = key_stats
         key_stats["count"] += 1
         key_stats["total_ms"] += duration_ms
+        self.total_press_count += 1
+        self.total_press_ms += duration_ms
         key_stats["max_ms"] = max(key_stats["max_ms"], duration_ms)
         if key_stats["min_ms"] is None or duration_ms < key_stats["min_ms"]:
             key_stats["min_ms"] = duration_ms
 
-    def _record_word_shape(self, word):
-        if not self.current_word_letter_events:
+    def _record_word_shape(self, word, seen):
+        if not self.letter_durations:
             return
         shapes = self.summary.setdefault("word_shapes", {}).setdefault(word, [])
-        shapes.append(
-            {
-                "durations": [entry["duration_ms"] for entry in self.current_word_letter_events],
-                "intervals": [entry["interval_ms"] for entry in self.current_word_letter_events],
-            }
-        )
+        # _finish_word starts fresh lists afterwards, so the sample can take these as-is.
+        sample = {"durations": self.letter_durations, "intervals": self.letter_intervals}
+        if len(shapes) < WORD_SHAPE_SAMPLES:
+            shapes.append(sample)
+            self.word_shape_samples += 1
+            return
+        # `seen` is this word's timed-run count, so each run stays in the sample with equal probability.
+        slot = random.randrange(max(seen, len(shapes) + 1))
+        if slot < len(shapes):
+            shapes[slot] = sample
 
     def _refresh_typing_profile(self):
-        interval_stats = self.summary.get("interval_stats", {})
-        count = interval_stats.get("count", 0)
-        avg_interval = interval_stats.get("total_ms", 0) / count if count else 0
-        key_lengths = self.summary.get("key_press_lengths", {})
-        total_press_ms = sum(entry.get("total_ms", 0) for entry in key_lengths.values())
-        total_press_count = sum(entry.get("count", 0) for entry in key_lengths.values())
-        avg_press_length = total_press_ms / total_press_count if total_press_count else 0
+        summary = self.summary
+        interval_stats = self.interval_stats
+        count = interval_stats["count"]
+        avg_interval = interval_stats["total_ms"] / count if count else 0
+        press_count = self.total_press_count
+        avg_press_length = self.total_press_ms / press_count if press_count else 0
         wpm = 60000 / avg_interval if avg_interval else 0
-        word_shapes = self.summary.get("word_shapes", {})
-        shapes_count = sum(len(values) for values in word_shapes.values())
-        long_pause_rate = (
-            self.summary.get("long_pauses", 0) / self.summary.get("total_events", 1)
-        )
+        total_events = summary.get("total_events") or 0
+        long_pause_rate = summary.get("long_pauses", 0) / total_events if total_events else 0
         profile = {
             "avg_interval": round(avg_interval, 1),
             "avg_press_length": round(avg_press_length, 1),
             "wpm": round(wpm, 1),
-            "avg_word_shape_samples": shapes_count,
+            "avg_word_shape_samples": self.word_shape_samples,
             "long_pause_rate": round(long_pause_rate, 3),
         }
-        self.summary["typing_profile"] = profile
+        summary["typing_profile"] = profile
 
     def _record_transition(self, key):
         if self.last_logged_key:
-            pairs = self.summary.setdefault("key_pairs", {}).setdefault(self.last_logged_key, {})
-            pairs.setdefault(key, 0)
-            pairs[key] += 1
+            pairs = self.key_pairs.get(self.last_logged_key)
+            if pairs is None:
+                pairs = {}
+                self.key_pairs[self.last_logged_key] = pairs
+            pairs[key] = pairs.get(key, 0) + 1
         self.last_logged_key = key
 
     def _update_summary(self, event):
         self.summary["total_events"] += 1
-        self.summary["key_counts"].setdefault(event["key"], 0)
-        self.summary["key_counts"][event["key"]] += 1
+        key_counts = self.key_counts
+        key_counts[event["key"]] = key_counts.get(event["key"], 0) + 1
 
         self._record_transition(event["key"])
         self._record_interval(event.get("interval_ms", 0))
@@ -282,21 +402,26 @@ class WrappedLogger:
         date_label = event["timestamp"][:10]
         if event["behaviors"].get("rage_click"):
             self.summary["rage_clicks"] += 1
-            self.summary["daily_rage"].setdefault(date_label, 0)
-            self.summary["daily_rage"][date_label] += 1
+            daily_rage = self.daily_rage
+            daily_rage[date_label] = daily_rage.get(date_label, 0) + 1
 
         if event["behaviors"].get("long_pause"):
             self.summary["long_pauses"] += 1
 
-        self.summary["daily_activity"].setdefault(date_label, 0)
-        self.summary["daily_activity"][date_label] += 1
+        daily_activity = self.daily_activity
+        daily_activity[date_label] = daily_activity.get(date_label, 0) + 1
         self.current_day_label = date_label
 
         self.summary["last_event"] = event["timestamp"]
         if self.summary["first_event"] is None:
             self.summary["first_event"] = event["timestamp"]
-        self._refresh_typing_profile()
-        self._persist_summary()
+        self.unsaved_events += 1
+        if (
+            self.last_persist is None
+            or self.unsaved_events >= PERSIST_EVERY_EVENTS
+            or time.monotonic() - self.last_persist >= PERSIST_INTERVAL_S
+        ):
+            self._persist_summary()
 
     def _init_speed_session(self):
         self.session_interval_total = 0.0
@@ -350,27 +475,26 @@ class WrappedLogger:
             word = "".join(self.word_buffer)
             if word:
                 self.summary["words"] += 1
-                self.summary["word_counts"].setdefault(word, 0)
-                self.summary["word_counts"][word] += 1
+                word_counts = self.summary["word_counts"]
+                word_counts[word] = word_counts.get(word, 0) + 1
 
                 if self.previous_word:
-                    pairs = self.summary["word_pairs"].setdefault(self.previous_word, {})
-                    pairs.setdefault(word, 0)
-                    pairs[word] += 1
+                    pairs = self.word_pairs.setdefault(self.previous_word, {})
+                    pairs[word] = pairs.get(word, 0) + 1
 
             self.previous_word = word
             if label:
-                day_words = self.summary["daily_word_counts"].setdefault(label, {})
-                day_words.setdefault(word, 0)
-                day_words[word] += 1
+                if label != self.day_words_label:
+                    self.day_words = self.summary["daily_word_counts"].setdefault(label, {})
+                    self.day_words_label = label
+                day_words = self.day_words
+                day_words[word] = day_words.get(word, 0) + 1
 
             if score_word:
                 self._score_word(word)
 
-            if self.word_start and self.word_last:
-                duration = int(
-                    (self.word_last - self.word_start).total_seconds() * 1000
-                )
+            if self.word_start is not None and self.word_last is not None:
+                duration = (self.word_last - self.word_start) // 1_000_000
                 word_times = self.summary.setdefault("word_durations", {})
                 stats = word_times.setdefault(
                     word,
@@ -381,16 +505,16 @@ class WrappedLogger:
                 stats["slowest_ms"] = max(stats["slowest_ms"], duration)
                 if stats["fastest_ms"] is None or duration < stats["fastest_ms"]:
                     stats["fastest_ms"] = duration
-                self._record_word_shape(word)
+                self._record_word_shape(word, stats["count"])
 
         self.word_buffer = []
         self.word_start = None
         self.word_last = None
-        self.current_word_letter_events = []
+        self.letter_durations = []
+        self.letter_intervals = []
 
         if reset_sequence:
             self.previous_word = None
-            self.current_word_letter_events = []
     
     def _score_word(self, word: str) -> bool:
         accuracy = self.summary.setdefault(
@@ -408,7 +532,8 @@ class WrappedLogger:
         score = max(0, min(score, self.accuracy_target))
         accuracy["score"] = score
         self._score_session_word(is_correct)
-        append_debug(f"Word '{word}' earned {points:+} accuracy point(s).")
+        if self.log_mode:
+            append_debug(f"Word '{word}' earned {points:+} accuracy point(s).")
         return is_correct
 
     def _normalize_key(self, key):
@@ -419,6 +544,15 @@ class WrappedLogger:
             text = text[len("Key.") :]
         return text.lower()
 
+    def _describe_key(self, key):
+        description = self.key_cache.get(key)
+        if description is None:
+            if len(self.key_cache) >= KEY_CACHE_SIZE:
+                self.key_cache.clear()
+            description = (self._normalize_key(key), *self._categorize(key))
+            self.key_cache[key] = description
+        return description
+
     def _categorize(self, key):
         if isinstance(key, keyboard.KeyCode) and key.char:
             if key.char.isalpha():
@@ -427,71 +561,69 @@ class WrappedLogger:
         return "action", False
 
     def on_press(self, key):
-        now = datetime.now(timezone.utc)
-        ts = now.isoformat()
-        date_label = ts[:10]
-        interval_ms = (
-            int((now - self.last_press_time).total_seconds() * 1000)
-            if self.last_press_time
-            else 0
-        )
-
-        normalized = self._normalize_key(key)
-        category, is_letter = self._categorize(key)
-
-        behaviors = {}
-        if self.last_key == normalized and interval_ms and interval_ms < self.min_rage_interval_ms:
-            self.rage_streak += 1
-        else:
-            self.rage_streak = 1
-
-        if self.rage_streak >= 4:
-            behaviors["rage_click"] = True
-
-        if interval_ms > self.session_gap_ms:
-            behaviors["long_pause"] = True
-            self._commit_speed_session()
-            self._finish_word(day_label=date_label, reset_sequence=True, score_word=False)
-
-        if is_letter:
-            self.word_buffer.append(normalized.lower())
-            if self.word_start is None:
-                self.word_start = now
-            self.word_last = now
-        else:
-            if normalized in {"space", "enter", "tab"}:
-                self._finish_word(day_label=date_label)
-
-        event = {
-            "timestamp": ts,
-            "key": normalized,
-            "category": category,
-            "interval_ms": interval_ms,
-            "behaviors": behaviors,
-            "duration_ms": None,
-        }
+        with self.lock:
+            if self.stopped:
+                return
+            now_ns = time.perf_counter_ns()
+            ts = _utc_isoformat(time.time_ns())
+            date_label = ts[:10]
+            last_press_ns = self.last_press_ns
+            interval_ms = (now_ns - last_press_ns) // 1_000_000 if last_press_ns is not None else 0
+
+            normalized, category, is_letter = self._describe_key(key)
+
+            behaviors = {}
+            if self.last_key == normalized and interval_ms and interval_ms < self.min_rage_interval_ms:
+                rage_streak = self.rage_streak + 1
+            else:
+                rage_streak = 1
+            self.rage_streak = rage_streak
+
+            if rage_streak >= 4:
+                behaviors["rage_click"] = True
+
+            if interval_ms > self.session_gap_ms:
+                behaviors["long_pause"] = True
+                self._commit_speed_session()
+                self._finish_word(day_label=date_label, reset_sequence=True, score_word=False)
+
+            if is_letter:
+                self.word_buffer.append(normalized.lower())
+                if self.word_start is None:
+                    self.word_start = now_ns
+                self.word_last = now_ns
+            else:
+                if normalized in {"space", "enter", "tab"}:
+                    self._finish_word(day_label=date_label)
+
+            event = {
+                "timestamp": ts,
+                "key": normalized,
+                "category": category,
+                "interval_ms": interval_ms,
+                "behaviors": behaviors,
+                "duration_ms": None,
+            }
 
-        self.pending_keys[key] = {"event": event, "press_time": now}
-        self.last_press_time = now
-        self.last_key = normalized
+            self.pending_keys[key] = (event, now_ns)
+            self.last_press_ns = now_ns
+            self.last_key = normalized
 
     def on_release(self, key):
-        record = self.pending_keys.pop(key, None)
-        if not record:
-            return
-        now = datetime.now(timezone.utc)
-        duration_ms = int((now - record["press_time"]).total_seconds() * 1000)
-        record["event"]["duration_ms"] = duration_ms
-        if record["event"]["category"] == "letter":
-            self.current_word_letter_events.append(
-                {
-                    "key": record["event"]["key"],
-                    "duration_ms": duration_ms,
-                    "interval_ms": record["event"].get("interval_ms", 0),
-                }
-            )
-        self._write_event(record["event"])
-        self._update_summary(record["event"])
+        with self.lock:
+            if self.stopped:
+                return
+            record = self.pending_keys.pop(key, None)
+            if not record:
+                return
+            event, press_ns = record
+            duration_ms = (time.perf_counter_ns() - press_ns) // 1_000_000
+            event["duration_ms"] = duration_ms
+            if event["category"] == "letter":
+                self.letter_durations.append(duration_ms)
+                self.letter_intervals.append(event.get("interval_ms", 0))
+            self._write_event(event)
+            self._update_summary(event)
 
     def _log_capture(self, event):
         key_repr = event.get("key") or event.get("code") or event.get("key_code") or "unknown"
@@ -506,29 +638,61 @@ class WrappedLogger:
         for key in list(self.pending_keys.keys()):
             self.on_release(key)
 
+    def autosave(self):
+        """Flush buffered events, and save the summary once PERSIST_INTERVAL_S has passed."""
+        with self.lock:
+            if self.stopped:
+                return
+            if self.unsaved_events and time.monotonic() - self.last_persist >= PERSIST_INTERVAL_S:
+                self._persist_summary()
+            elif self.unflushed_events:
+                self._flush_log()
+
+    def start_autosave(self):
+        thread = threading.Thread(target=self._autosave_loop, name="summary-autosave", daemon=True)
+        thread.start()
+        return thread
+
+    def _autosave_loop(self):
+        while not self.stop_event.wait(LOG_FLUSH_INTERVAL_S):
+            self.autosave()
+
     def stop(self):
-        self._flush_pending_keys()
-        self._finish_word(day_label=self.current_day_label, score_word=False)
-        self._refresh_typing_profile()
-        self._commit_speed_session()
-        self.log_file.close()
-        with open(self.summary_path, "w", encoding="utf-8") as summary_file:
-            json.dump(self.summary, summary_file, ensure_ascii=False, indent=2)
+        with self.lock:
+            if self.stopped:
+                return
+            self._flush_pending_keys()
+            self._finish_word(day_label=self.current_day_label, score_word=False)
+            self._commit_speed_session()
+            self._persist_summary(sync=True)
+            self.log_file.close()
+            self.stopped = True
+            self.stop_event.set()
 
-    def _persist_summary(self):
+    def _persist_summary(self, sync=False):
+        self._refresh_typing_profile()
         self.summary_path.parent.mkdir(parents=True, exist_ok=True)
         temp = self.summary_path.with_suffix(self.summary_path.suffix + ".tmp")
-        with temp.open("w", encoding="utf-8") as summary_file:
-            json.dump(self.summary, summary_file, ensure_ascii=False, indent=2)
-            summary_file.flush()
-            os.fsync(summary_file.fileno())
+        with temp.open("wb") as summary_file:
+            summary_file.write(_dumps_summary(self.summary))
+            if sync:
+                summary_file.flush()
+                os.fsync(summary_file.fileno())
         temp.replace(self.summary_path)
+        self._flush_log()
+        self.unsaved_events = 0
+        self.last_persist = time.monotonic()
         append_debug(
             f"Summary saved: {self.summary['total_events']} events, "
             f"{self.summary['typing_profile']['avg_interval']}ms avg interval"
         )
 
 
+def _exit_on_sigterm(signum, frame):
+    # Unwind through main's finally so the final persist runs, as with Ctrl+C.
+    raise SystemExit(128 + signum)
+
+
 def parse_args():
     parser = argparse.ArgumentParser(description="Capture a year's worth of key usage.")
     parser.add_argument(
@@ -558,6 +722,9 @@ def parse_args():
 def main():
     args = parse_args()
     logger = WrappedLogger(args.log_file, args.summary, log_mode=args.log_mode)
+    atexit.register(logger.stop)
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    logger.start_autosave()
     print("Logger is running. Press Ctrl+C to stop and flush the summary.")
     write_health_status("starting", "Preparing keyboard listener.")
 
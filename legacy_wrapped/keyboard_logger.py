@@ -3,7 +3,9 @@
 
 import argparse
 import json
+import os
 import sys
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -16,75 +18,83 @@ except ImportError:  # pragma: no cover
     )
     sys.exit(1)
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+# Events are flushed in batches, and whenever the typist pauses.
+LOG_FLUSH_EVERY_EVENTS = 256
+LOG_BUFFER_BYTES = 1 << 16
+
 
 def _timestamp_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _empty_summary():
+    return {
+        "total_events": 0,
+        "letters": 0,
+        "actions": 0,
+        "words": 0,
+        "rage_clicks": 0,
+        "long_pauses": 0,
+        "first_event": None,
+        "last_event": None,
+        "key_counts": {},
+        "daily_activity": {},
+        "daily_rage": {},
+        "daily_word_counts": {},
+        "word_counts": {},
+        "word_pairs": {},
+    }
+
+
 class WrappedLogger:
     def __init__(self, log_path: Path, summary_path: Path, min_rage_interval_ms=450):
         self.log_path = log_path
         self.summary_path = summary_path
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
         self.summary_path.parent.mkdir(parents=True, exist_ok=True)
-        self.log_file = open(self.log_path, "a", encoding="utf-8")
+        self.log_file = open(self.log_path, "ab", buffering=LOG_BUFFER_BYTES)
+        self.events_since_flush = 0
 
-        self.last_press_time = None
+        self.last_press_ns = None
         self.last_key = None
         self.rage_streak = 0
         self.word_buffer = []
         self.previous_word = None
         self.current_day_label = None
+        self.key_names = {}
         self.summary = self._load_existing_summary()
         self.min_rage_interval_ms = min_rage_interval_ms
 
     def _load_existing_summary(self):
         if not self.summary_path.exists():
-            return {
-                "total_events": 0,
-                "letters": 0,
-                "actions": 0,
-                "words": 0,
-                "rage_clicks": 0,
-                "long_pauses": 0,
-                "first_event": None,
-                "last_event": None,
-                "key_counts": {},
-                "daily_activity": {},
-                "daily_rage": {},
-                "daily_word_counts": {},
-                "word_counts": {},
-                "word_pairs": {},
-            }
-        with open(self.summary_path, "r", encoding="utf-8") as existing:
+            return _empty_summary()
+        with open(self.summary_path, "rb") as existing:
             try:
-                return json.load(existing)
-            except json.JSONDecodeError:  # pragma: no cover
-                return {
-                    "total_events": 0,
-                    "letters": 0,
-                    "actions": 0,
-                    "words": 0,
-                    "rage_clicks": 0,
-                    "long_pauses": 0,
-                    "first_event": None,
-                    "last_event": None,
-                    "key_counts": {},
-                    "daily_activity": {},
-                    "daily_rage": {},
-                    "daily_word_counts": {},
-                    "word_counts": {},
-                    "word_pairs": {},
-                }
+                raw = existing.read()
+                return orjson.loads(raw) if orjson is not None else json.loads(raw)
+            except ValueError:  # pragma: no cover
+                return _empty_summary()
 
     def _write_event(self, event):
-        self.log_file.write(json.dumps(event, ensure_ascii=False) + "\n")
-        self.log_file.flush()
+        if orjson is not None:
+            self.log_file.write(orjson.dumps(event, option=orjson.OPT_APPEND_NEWLINE))
+        else:
+            self.log_file.write((json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8"))
+        self.events_since_flush += 1
+        if self.events_since_flush >= LOG_FLUSH_EVERY_EVENTS or event["behaviors"].get("long_pause"):
+            self.log_file.flush()
+            self.events_since_flush = 0
 
     def _update_summary(self, event):
         self.summary["total_events"] += 1
-        self.summary["key_counts"].setdefault(event["key"], 0)
-        self.summary["key_counts"][event["key"]] += 1
+        key_counts = self.summary["key_counts"]
+        key_counts[event["key"]] = key_counts.get(event["key"], 0) + 1
 
         if event["category"] == "letter":
             self.summary["letters"] += 1
@@ -94,14 +104,14 @@ class WrappedLogger:
         date_label = event["timestamp"][:10]
         if event["behaviors"].get("rage_click"):
             self.summary["rage_clicks"] += 1
-            self.summary["daily_rage"].setdefault(date_label, 0)
-            self.summary["daily_rage"][date_label] += 1
+            daily_rage = self.summary["daily_rage"]
+            daily_rage[date_label] = daily_rage.get(date_label, 0) + 1
 
         if event["behaviors"].get("long_pause"):
             self.summary["long_pauses"] += 1
 
-        self.summary["daily_activity"].setdefault(date_label, 0)
-        self.summary["daily_activity"][date_label] += 1
+        daily_activity = self.summary["daily_activity"]
+        daily_activity[date_label] = daily_activity.get(date_label, 0) + 1
         self.current_day_label = date_label
 
         self.summary["last_event"] = event["timestamp"]
@@ -116,19 +126,17 @@ class WrappedLogger:
             word = "".join(self.word_buffer)
             if word:
                 self.summary["words"] += 1
-                self.summary["word_counts"].setdefault(word, 0)
-                self.summary["word_counts"][word] += 1
+                word_counts = self.summary["word_counts"]
+                word_counts[word] = word_counts.get(word, 0) + 1
 
                 if self.previous_word:
                     pairs = self.summary["word_pairs"].setdefault(self.previous_word, {})
-                    pairs.setdefault(word, 0)
-                    pairs[word] += 1
+                    pairs[word] = pairs.get(word, 0) + 1
 
                 self.previous_word = word
                 if label:
                     day_words = self.summary["daily_word_counts"].setdefault(label, {})
-                    day_words.setdefault(word, 0)
-                    day_words[word] += 1
+                    day_words[word] = day_words.get(word, 0) + 1
 
             self.word_buffer = []
 
@@ -138,7 +146,14 @@ class WrappedLogger:
     def _normalize_key(self, key):
         if isinstance(key, keyboard.KeyCode) and key.char:
             return key.char
-        return str(key).strip("Key.").lower()
+        name = self.key_names.get(key)
+        if name is None:
+            # Only strip the "Key." prefix; str.strip("Key.") also ate letters such as the "e" in "space".
+            text = str(key)
+            if text.startswith("Key."):
+                text = text[len("Key.") :]
+            name = self.key_names[key] = text.lower()
+        return name
 
     def _categorize(self, key):
         if isinstance(key, keyboard.KeyCode) and key.char:
@@ -148,14 +163,11 @@ class WrappedLogger:
         return "action", False
 
     def on_press(self, key):
-        now = datetime.now(timezone.utc)
-        ts = now.isoformat()
+        now_ns = time.perf_counter_ns()
+        ts = datetime.now(timezone.utc).isoformat()
         date_label = ts[:10]
-        interval_ms = (
-            int((now - self.last_press_time).total_seconds() * 1000)
-            if self.last_press_time
-            else 0
-        )
+        last_press_ns = self.last_press_ns
+        interval_ms = (now_ns - last_press_ns) // 1_000_000 if last_press_ns is not None else 0
 
         normalized = self._normalize_key(key)
         category, is_letter = self._categorize(key)
@@ -189,14 +201,22 @@ class WrappedLogger:
 
         self._write_event(event)
         self._update_summary(event)
-        self.last_press_time = now
+        self.last_press_ns = now_ns
         self.last_key = normalized
 
     def stop(self):
         self._finish_word(day_label=self.current_day_label)
         self.log_file.close()
-        with open(self.summary_path, "w", encoding="utf-8") as summary_file:
-            json.dump(self.summary, summary_file, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            payload = orjson.dumps(self.summary, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(self.summary, ensure_ascii=False, indent=2).encode("utf-8")
+        temp = self.summary_path.with_suffix(self.summary_path.suffix + ".tmp")
+        with temp.open("wb") as summary_file:
+            summary_file.write(payload)
+            summary_file.flush()
+            os.fsync(summary_file.fileno())
+        temp.replace(self.summary_path)
 
 
 def parse_args():
@@ -126,7 +126,7 @@ final class StatusBarController: NSObject, NSApplicationDelegate {
         }
         let process = Process()
         process.executableURL = URL(fileURLWithPath: "/bin/kill")
-        process.arguments = ["-9", "\(pid)"]
+        process.arguments = ["-TERM", "\(pid)"]
         try? process.run()
         try? process.waitUntilExit()
         try? FileManager.default.removeItem(at: pidFile)
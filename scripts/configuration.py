@@ -1,8 +1,14 @@
+import functools
 import json
 import os
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 DEFAULT_WIDGET_CONFIG = {
     "progress_path": "data/widget_progress.json",
     "gpt_feed_path": "data/widget_gpt_feed.json",
@@ -25,12 +31,25 @@ def config_path(root: Optional[Path] = None) -> Path:
     return resolve_root(root) / "config" / "app.json"
 
 
+@functools.lru_cache(maxsize=8)
+def _read_app_config(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    raw = Path(path).read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
 def load_app_config(root: Optional[Path] = None) -> Dict[str, Any]:
+    """Return the parsed config; the result is shared between callers, so treat it as read-only."""
     path = config_path(root)
-    if not path.exists():
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
         return {}
-    with path.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
+    # Keyed on mtime and size so edits to app.json (or a new root) are picked up without a restart.
+    return _read_app_config(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def clear_config_cache() -> None:
+    _read_app_config.cache_clear()
 
 
 def widget_paths(
@@ -71,14 +71,15 @@ device_meta = {
 }
 
 word_pairs = {}
-for word in WORDS:
-    targets = random.sample([w for w in WORDS if w != word], 4)
+# Slicing around the current item keeps the population order, so the seeded output is unchanged.
+for index, word in enumerate(WORDS):
+    targets = random.sample(WORDS[:index] + WORDS[index + 1 :], 4)
     word_pairs[word] = {target: random.randint(120, 460) for target in targets}
 
 key_pairs = {}
 all_keys = LETTERS + ACTIONS
-for key in all_keys:
-    neighbors = random.sample([k for k in all_keys if k != key], 5)
+for index, key in enumerate(all_keys):
+    neighbors = random.sample(all_keys[:index] + all_keys[index + 1 :], 5)
     key_pairs[key] = {neighbor: random.randint(45, 200) for neighbor in neighbors}
 
 word_durations = {}
@@ -1,8 +1,14 @@
+import functools
 import json
 import time
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 from .configuration import widget_paths as configuration_widget_paths
 
 
@@ -30,22 +36,29 @@ def write_health_status(
     append_debug(message or status, paths["debug"])
 
 
+@functools.lru_cache(maxsize=1)
+def _local_second(second: int) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+
+
 def append_debug(message: str, debug_path: Optional[Path] = None):
     if not message:
         return
     path = debug_path or widget_paths()["debug"]
     path.parent.mkdir(parents=True, exist_ok=True)
-    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    # Debug lines arrive in bursts (a mock injection, a GPT cycle), so reuse the formatted second.
+    timestamp = _local_second(int(time.time()))
     with path.open("a", encoding="utf-8") as fh:
         fh.write(f"{timestamp} {message}\n")
 
 
 def load_health_status(root: Optional[Path] = None, config: Optional[Dict[str, Any]] = None):
     paths = widget_paths(root, config)
-    if not paths["health"].exists():
+    try:
+        raw = paths["health"].read_bytes()
+    except FileNotFoundError:
+        return {}
+    try:
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except ValueError:
         return {}
-    with paths["health"].open("r", encoding="utf-8") as fh:
-        try:
-            return json.load(fh)
-        except json.JSONDecodeError:
-            return {}
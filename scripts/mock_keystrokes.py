@@ -2,18 +2,25 @@
 """Simulate keystrokes to validate logger+widget plumbing without a physical keyboard."""
 
 import argparse
+import functools
 import json
 import math
 import time
 from pathlib import Path
 from string import ascii_letters
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 
 from scripts.logger_health import append_debug
 from scripts.configuration import load_app_config as load_config
 from scripts.word_checker import WordChecker
 
 LONG_PAUSE_THRESHOLD_MS = 800
+ASCII_LETTERS = frozenset(ascii_letters)
 
 
 def _default_summary() -> Dict[str, Any]:
@@ -44,49 +51,64 @@ def _default_summary() -> Dict[str, Any]:
             "wpm": 0,
             "avg_word_shape_samples": 0,
             "long_pause_rate": 0,
+            "_press_total_ms": 0,
+            "_press_total_count": 0,
         },
     }
 
 
 def load_summary(path: Path) -> Dict[str, Any]:
-    if not path.exists():
-        return _default_summary()
-    with path.open("r", encoding="utf-8") as fh:
-        existing = json.load(fh)
-    summary = {**_default_summary(), **existing}
-    # ensure nested defaults exist
-    summary.setdefault("typing_profile", _default_summary()["typing_profile"])
-    summary.setdefault("interval_stats", _default_summary()["interval_stats"])
-    summary.setdefault("key_pairs", {})
-    summary.setdefault("key_press_lengths", {})
+    summary = _default_summary()
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
+        return summary
+    # Saved sections replace the defaults wholesale; missing ones keep their fresh default.
+    summary.update(orjson.loads(raw) if orjson is not None else json.loads(raw))
     return summary
 
 
 def persist_summary(summary: Dict[str, Any], path: Path):
     path.parent.mkdir(parents=True, exist_ok=True)
+    typing = summary.get("typing_profile")
+    if isinstance(typing, dict) and "_press_total_count" in typing:
+        # The running press totals are derivable from key_press_lengths, so keep them off disk.
+        profile = {key: value for key, value in typing.items() if not key.startswith("_press_total")}
+        summary = {**summary, "typing_profile": profile}
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(summary, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
     with path.open("w", encoding="utf-8") as fh:
         json.dump(summary, fh, ensure_ascii=False, indent=2)
 
 
 def append_keystroke(event: Dict[str, Any], log_path: Path):
+    append_keystrokes([event], log_path)
+
+
+def append_keystrokes(events: Iterable[Dict[str, Any]], log_path: Path):
     log_path.parent.mkdir(parents=True, exist_ok=True)
-    with log_path.open("a", encoding="utf-8") as fh:
-        fh.write(json.dumps(event, ensure_ascii=False) + "\n")
+    if orjson is not None:
+        lines = b"".join(orjson.dumps(event, option=orjson.OPT_APPEND_NEWLINE) for event in events)
+    else:
+        lines = "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events).encode("utf-8")
+    with log_path.open("ab") as fh:
+        fh.write(lines)
 
 
-def record_event(
+def _tally_event(
     summary: Dict[str, Any],
     key: str,
     interval_ms: float,
     duration_ms: float,
-    timestamp: Optional[float] = None,
-    previous_key: Optional[str] = None,
+    timestamp: Optional[float],
+    previous_key: Optional[str],
 ) -> Dict[str, Any]:
     if timestamp is None:
         timestamp = time.time()
     total = summary.get("total_events", 0) + 1
     summary["total_events"] = total
-    if key and key[0].lower() in ascii_letters:
+    if key and key[0].lower() in ASCII_LETTERS:
         summary["letters"] = summary.get("letters", 0) + 1
     else:
         summary["actions"] = summary.get("actions", 0) + 1
@@ -94,49 +116,95 @@ def record_event(
         summary["long_pauses"] = summary.get("long_pauses", 0) + 1
     summary["last_event"] = timestamp
     summary["first_event"] = summary.get("first_event") or timestamp
-    summary["key_counts"][key] = summary["key_counts"].get(key, 0) + 1
+    key_counts = summary["key_counts"]
+    key_counts[key] = key_counts.get(key, 0) + 1
 
     key_pairs = summary.setdefault("key_pairs", {})
     if previous_key:
-        target = key_pairs.setdefault(previous_key, {})
+        target = key_pairs.get(previous_key)
+        if target is None:
+            target = {}
+            key_pairs[previous_key] = target
         target[key] = target.get(key, 0) + 1
 
     lengths = summary.setdefault("key_press_lengths", {})
-    key_stats = lengths.setdefault(
-        key, {"count": 0, "total_ms": 0, "max_ms": 0, "min_ms": None}
-    )
+    typing = summary.setdefault("typing_profile", {})
+    if "_press_total_count" not in typing:
+        # Summaries loaded from disk carry no running totals; rebuild them once.
+        typing["_press_total_ms"] = sum(stats["total_ms"] for stats in lengths.values())
+        typing["_press_total_count"] = sum(stats["count"] for stats in lengths.values())
+    typing["_press_total_ms"] += duration_ms
+    typing["_press_total_count"] += 1
+    key_stats = lengths.get(key)
+    if key_stats is None:
+        key_stats = {"count": 0, "total_ms": 0, "max_ms": 0, "min_ms": None}
+        lengths[key] = key_stats
     key_stats["count"] += 1
     key_stats["total_ms"] += duration_ms
     key_stats["max_ms"] = max(key_stats["max_ms"], duration_ms)
     if key_stats["min_ms"] is None or duration_ms < key_stats["min_ms"]:
         key_stats["min_ms"] = duration_ms
 
-    interval_stats = summary.setdefault(
-        "interval_stats", {"count": 0, "total_ms": 0, "max_ms": 0, "min_ms": None}
-    )
+    interval_stats = summary.get("interval_stats")
+    if interval_stats is None:
+        interval_stats = {"count": 0, "total_ms": 0, "max_ms": 0, "min_ms": None}
+        summary["interval_stats"] = interval_stats
     interval_stats["count"] += 1
     interval_stats["total_ms"] += interval_ms
     interval_stats["max_ms"] = max(interval_stats["max_ms"], interval_ms)
     if interval_stats["min_ms"] is None or interval_ms < interval_stats["min_ms"]:
         interval_stats["min_ms"] = interval_ms
+    return {
+        "timestamp": timestamp,
+        "key": key,
+        "interval_ms": interval_ms,
+        "duration_ms": duration_ms,
+    }
 
-    typing = summary.setdefault("typing_profile", {})
+
+def _refresh_typing_profile(summary: Dict[str, Any]):
+    typing = summary["typing_profile"]
+    interval_stats = summary["interval_stats"]
     count = interval_stats["count"]
     avg_interval = interval_stats["total_ms"] / count if count else 0
     typing["avg_interval"] = round(avg_interval, 1)
-    total_length = sum(stats["total_ms"] for stats in lengths.values())
-    total_count = sum(stats["count"] for stats in lengths.values())
+    total_length = typing["_press_total_ms"]
+    total_count = typing["_press_total_count"]
     typing["avg_press_length"] = round(total_length / total_count, 1) if total_count else 0
     typing["wpm"] = round(60000 / avg_interval, 1) if avg_interval else 0
     typing["long_pause_rate"] = round(
         summary.get("long_pauses", 0) / max(summary["total_events"], 1), 3
     )
-    return {
-        "timestamp": timestamp,
-        "key": key,
-        "interval_ms": interval_ms,
-        "duration_ms": duration_ms,
-    }
+
+
+def record_event(
+    summary: Dict[str, Any],
+    key: str,
+    interval_ms: float,
+    duration_ms: float,
+    timestamp: Optional[float] = None,
+    previous_key: Optional[str] = None,
+) -> Dict[str, Any]:
+    event = _tally_event(summary, key, interval_ms, duration_ms, timestamp, previous_key)
+    _refresh_typing_profile(summary)
+    return event
+
+
+def record_events(
+    summary: Dict[str, Any],
+    keys: Iterable[str],
+    interval_ms: float,
+    duration_ms: float,
+    previous_key: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Record a run of keys, recomputing the typing profile once at the end."""
+    events = []
+    for key in keys:
+        events.append(_tally_event(summary, key, interval_ms, duration_ms, None, previous_key))
+        previous_key = key
+    if events:
+        _refresh_typing_profile(summary)
+    return events
 
 
 def inject_keys(
@@ -148,13 +216,8 @@ def inject_keys(
     duration_ms: float = 60.0,
 ):
     summary = load_summary(summary_path)
-    previous = None
-    events: List[Dict[str, Any]] = []
-    for key in keys:
-        event = record_event(summary, key, interval_ms, duration_ms, previous_key=previous)
-        append_keystroke(event, keystroke_path)
-        events.append(event)
-        previous = key
+    events = record_events(summary, keys, interval_ms, duration_ms)
+    append_keystrokes(events, keystroke_path)
     _score_mock_word(summary, keys, debug_path)
     persist_summary(summary, summary_path)
     if debug_path:
@@ -217,6 +280,11 @@ def main():
     )
 
 
+@functools.lru_cache(maxsize=8)
+def _word_checker(threshold: float, min_length: int, extra_words: Tuple[str, ...]) -> WordChecker:
+    return WordChecker(threshold=threshold, min_length=min_length, extra_words=extra_words)
+
+
 def _score_mock_word(summary: Dict[str, Any], keys: Iterable[str], debug_path: Optional[Path]):
     word = "".join(str(key).lower() for key in keys if str(key).isalpha())
     if not word:
@@ -227,12 +295,11 @@ def _score_mock_word(summary: Dict[str, Any], keys: Iterable[str], debug_path: O
         "correct": float(accuracy_config.get("correct_points", 1)),
         "incorrect": float(accuracy_config.get("incorrect_points", -2)),
     }
-    checker_kwargs = {
-        "threshold": float(accuracy_config.get("threshold", 2.5)),
-        "min_length": int(accuracy_config.get("min_word_length", 1)),
-        "extra_words": accuracy_config.get("extra_words") or [],
-    }
-    checker = WordChecker(**checker_kwargs)
+    checker = _word_checker(
+        float(accuracy_config.get("threshold", 2.5)),
+        int(accuracy_config.get("min_word_length", 1)),
+        tuple(accuracy_config.get("extra_words") or ()),
+    )
     accuracy = summary.setdefault(
         "word_accuracy",
         {"score": 0, "correct": 0, "incorrect": 0},
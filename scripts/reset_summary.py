@@ -9,49 +9,56 @@ import time
 from pathlib import Path
 from typing import Optional
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from scripts.configuration import resolve_root, widget_paths
 
-BASE_FIELDS = {
-    "total_events": 0,
-    "letters": 0,
-    "actions": 0,
-    "words": 0,
-    "rage_clicks": 0,
-    "long_pauses": 0,
-    "daily_activity": {},
-    "daily_rage": {},
-    "daily_word_counts": {},
-    "key_counts": {},
-    "word_pairs": {},
-    "word_shapes": {},
-    "key_press_lengths": {},
-    "word_durations": {},
-    "device_meta": {},
-    "word_counts": {},
-    "word_pairs": {},
-    "first_event": None,
-    "last_event": None,
-    "typing_profile": {
-        "avg_interval": 0,
-        "avg_press_length": 0,
-        "wpm": 0,
-        "avg_word_shape_samples": 0,
-        "long_pause_rate": 0,
-    },
-    "word_accuracy": {"score": 0, "correct": 0, "incorrect": 0},
-    "interval_stats": {"count": 0, "total_ms": 0, "max_ms": 0, "min_ms": None},
-    "speed_points": {
-        "earned": 0,
-        "sessions": 0,
-        "last_avg_interval": 0,
-        "last_accuracy_pct": 0,
-        "target_sessions": 0,
-    },
-}
+
+def _fresh_summary() -> dict:
+    return {
+        "total_events": 0,
+        "letters": 0,
+        "actions": 0,
+        "words": 0,
+        "rage_clicks": 0,
+        "long_pauses": 0,
+        "daily_activity": {},
+        "daily_rage": {},
+        "daily_word_counts": {},
+        "key_counts": {},
+        "word_pairs": {},
+        "word_shapes": {},
+        "key_press_lengths": {},
+        "word_durations": {},
+        "device_meta": {},
+        "word_counts": {},
+        "first_event": None,
+        "last_event": None,
+        "typing_profile": {
+            "avg_interval": 0,
+            "avg_press_length": 0,
+            "wpm": 0,
+            "avg_word_shape_samples": 0,
+            "long_pause_rate": 0,
+        },
+        "word_accuracy": {"score": 0, "correct": 0, "incorrect": 0},
+        "interval_stats": {"count": 0, "total_ms": 0, "max_ms": 0, "min_ms": None},
+        "speed_points": {
+            "earned": 0,
+            "sessions": 0,
+            "last_avg_interval": 0,
+            "last_accuracy_pct": 0,
+            "target_sessions": 0,
+        },
+    }
+
 
 DEFAULT_PROGRESS_SNAPSHOT = {
     "timestamp": 0,
@@ -70,18 +77,23 @@ DEFAULT_PROGRESS_SNAPSHOT = {
 def atomic_write(path: Path, payload: dict):
     path.parent.mkdir(parents=True, exist_ok=True)
     temporary = path.with_suffix(path.suffix + ".tmp")
-    with temporary.open("w", encoding="utf-8") as fh:
-        json.dump(payload, fh, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        data = orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+    with temporary.open("wb") as fh:
+        fh.write(data)
         fh.flush()
         os.fsync(fh.fileno())
     temporary.replace(path)
 
 
 def load_summary(path: Path) -> dict:
-    if not path.exists():
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
         return {}
-    with path.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 
 def write_summary(path: Path, payload: dict):
@@ -91,13 +103,13 @@ def write_summary(path: Path, payload: dict):
 def reset_daily(path: Path):
     summary = load_summary(path)
     device_meta = summary.get("device_meta", {})
-    new_summary = {**BASE_FIELDS}
+    new_summary = _fresh_summary()
     new_summary["device_meta"] = device_meta
     write_summary(path, new_summary)
 
 
 def reset_widget_progress(path: Path, mode: str = "real"):
-    snapshot = {**DEFAULT_PROGRESS_SNAPSHOT}
+    snapshot = DEFAULT_PROGRESS_SNAPSHOT.copy()
     snapshot["mode"] = mode
     snapshot["timestamp"] = time.time()
     atomic_write(path, snapshot)
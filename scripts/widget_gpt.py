@@ -1,13 +1,17 @@
 import argparse
 import hashlib
 import json
-import os
 import sys
 import textwrap
 import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 REPO_ROOT = Path(__file__).resolve().parent.parent
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
@@ -30,6 +34,14 @@ except ModuleNotFoundError as exc:
 
 
 DEFAULT_POLL = 4.0
+# Keep each debug entry on one line whatever newline style the prompt or reply uses.
+LOG_NEWLINES = str.maketrans("\r\n", "  ")
+
+DIFF_FIELDS = (
+    ("keyProgress", "Keystrokes"),
+    ("speedProgress", "Speed points"),
+    ("handshakeProgress", "Keyboard balance"),
+)
 
 DEFAULT_RING_PROMPT_TEMPLATE = textwrap.dedent(
     """\
@@ -41,32 +53,52 @@ Offer a single encouraging sentence that nudges the user toward the next milesto
 
 
 def load_json(path: Path) -> Dict[str, Any]:
-    if not path.exists():
-        raise FileNotFoundError(f"{path} is missing")
-    with path.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"{path} is missing") from None
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 
-def write_json(path: Path, payload: Dict[str, Any]):
+def write_json(path: Path, payload: Dict[str, Any], pretty: bool = True):
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2))
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        data = orjson.dumps(payload, option=option)
+    elif pretty:
+        data = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+    else:
+        data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    # The Swift widget polls these files; never let it see a half-written one.
+    temporary = path.with_suffix(path.suffix + ".tmp")
+    temporary.write_bytes(data)
+    temporary.replace(path)
 
 
 def snapshot_hash(snapshot: Dict[str, Any]) -> str:
-    payload = json.dumps(snapshot, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
-    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    # Every writer stamps a fresh timestamp on each refresh; only the ring values count as a change.
+    stable = {key: value for key, value in snapshot.items() if key != "timestamp"}
+    if orjson is not None:
+        payload = orjson.dumps(stable, option=orjson.OPT_SORT_KEYS)
+    else:
+        payload = json.dumps(
+            stable, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+    return _digest(payload)
+
+
+def _digest(data: bytes) -> str:
+    # Only used to spot changes between polls, so a short BLAKE2b digest is plenty.
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
 
 
 def describe_diff(
     current: Dict[str, Any], previous: Dict[str, Any]
 ) -> List[str]:
     diffs = []
-    mapping = [
-        ("keyProgress", "Keystrokes"),
-        ("speedProgress", "Speed points"),
-        ("handshakeProgress", "Keyboard balance"),
-    ]
-    for key, label in mapping:
+    for key, label in DIFF_FIELDS:
         current_value = float(current.get(key, 0))
         prev_value = float(previous.get(key, 0))
         delta = current_value - prev_value
@@ -83,16 +115,17 @@ def build_ring_prompt(
     mode: str,
     template: str,
 ) -> str:
+    get = snapshot.get
     context = {
         "mode": mode,
-        "keyProgress": snapshot.get("keyProgress", 0),
-        "keyTarget": snapshot.get("keyTarget", 5000),
-        "speedProgress": int(snapshot.get("speedProgress", 0)),
-        "speedTarget": snapshot.get("speedTarget", 120),
-        "handshakeProgress": int(snapshot.get("handshakeProgress", 0)),
-        "handshakeTarget": snapshot.get("handshakeTarget", 80),
-        "wordAccuracyScore": snapshot.get("wordAccuracyScore", 0),
-        "wordAccuracyTarget": snapshot.get("wordAccuracyTarget", 120),
+        "keyProgress": get("keyProgress", 0),
+        "keyTarget": get("keyTarget", 5000),
+        "speedProgress": int(get("speedProgress", 0)),
+        "speedTarget": get("speedTarget", 120),
+        "handshakeProgress": int(get("handshakeProgress", 0)),
+        "handshakeTarget": get("handshakeTarget", 80),
+        "wordAccuracyScore": get("wordAccuracyScore", 0),
+        "wordAccuracyTarget": get("wordAccuracyTarget", 120),
         "diff_text": "; ".join(diff_lines) or "steady rhythm",
     }
     try:
@@ -105,11 +138,12 @@ def fallback_message(
     snapshot: Dict[str, Any], diff_lines: List[str], mode: str, iteration: int
 ) -> str:
     diff_text = diff_lines[0] if diff_lines else "steady rhythm"
+    get = snapshot.get
     return (
         f"[{mode}] iteration {iteration}: {diff_text}. "
-        f"Key strokes {int(snapshot.get('keyProgress', 0))}, "
-        f"Speed {int(snapshot.get('speedProgress', 0))}, "
-        f"Balance {int(snapshot.get('handshakeProgress', 0))}."
+        f"Key strokes {int(get('keyProgress', 0))}, "
+        f"Speed {int(get('speedProgress', 0))}, "
+        f"Balance {int(get('handshakeProgress', 0))}."
     )
 
 
@@ -122,13 +156,23 @@ def run_cycle(
     mode: str,
     dry_run: bool,
 ) -> bool:
-    if not progress_path.exists():
+    try:
+        raw = progress_path.read_bytes()
+    except FileNotFoundError:
         return False
-    snapshot = load_json(progress_path)
-    current_hash = snapshot_hash(snapshot)
-    state = {}
-    if state_path.exists():
+    raw_hash = _digest(raw)
+    try:
         state = load_json(state_path)
+    except FileNotFoundError:
+        state = {}
+    if not dry_run and state.get("last_raw_hash") == raw_hash:
+        # Same bytes as the last insight saw, so there is nothing to parse.
+        return False
+    snapshot = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    current_hash = snapshot_hash(snapshot)
+    if not dry_run and state.get("last_hash") == current_hash:
+        # Nothing moved since the last insight; skip the GPT call and both rewrites.
+        return False
     previous_snapshot = state.get("last_snapshot", {})
     diff_lines = describe_diff(snapshot, previous_snapshot)
     iteration = int(state.get("iteration", 0)) + 1
@@ -141,14 +185,19 @@ def run_cycle(
     )
     message = fallback_message(snapshot, diff_lines, mode, iteration)
     append_debug(
-        f"GPT prompt (mode {mode}, iteration {iteration}): {prompt[:400].replace(os.linesep, ' ')}",
+        f"GPT prompt (mode {mode}, iteration {iteration}): {prompt[:400].translate(LOG_NEWLINES)}",
         debug_path,
     )
-    if not dry_run:
+    reply = None
+    if not dry_run and state.get("last_prompt") == prompt and state.get("last_message"):
+        # Idle refreshes rebuild the same prompt; reuse the reply instead of paying for another.
+        reply = message = state["last_message"]
+        append_debug(f"GPT prompt unchanged (iteration {iteration}); reusing last reply", debug_path)
+    elif not dry_run:
         try:
-            message = call_openai(prompt, config)
+            reply = message = call_openai(prompt, config)
             append_debug(
-                f"GPT response (iteration {iteration}, mode {mode}): {message[:400].replace(os.linesep, ' ')}",
+                f"GPT response (iteration {iteration}, mode {mode}): {message[:400].translate(LOG_NEWLINES)}",
                 debug_path,
             )
         except Exception as exc:  # pragma: no cover
@@ -169,14 +218,19 @@ def run_cycle(
             "diff_summary": diff_summary,
             "progress": snapshot,
         },
+        pretty=False,
     )
     write_json(
         state_path,
         {
             "last_hash": current_hash,
+            "last_raw_hash": raw_hash,
             "last_snapshot": snapshot,
+            "last_prompt": prompt if reply else None,
+            "last_message": reply,
             "iteration": iteration,
         },
+        pretty=False,
     )
     return True
 
@@ -209,11 +263,19 @@ def main(argv: Optional[List[str]] = None):
         cycle()
         return
 
+    last_mtime = None
     while True:
         try:
-            cycle()
-        except Exception as exc:  # pragma: no cover
-            print(f"Widget GPT bridge error: {exc}", file=sys.stderr)
+            mtime = paths["progress"].stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        # Only parse and hash the progress file once it has been rewritten.
+        if mtime is None or mtime != last_mtime:
+            try:
+                cycle()
+                last_mtime = mtime
+            except Exception as exc:  # pragma: no cover
+                print(f"Widget GPT bridge error: {exc}", file=sys.stderr)
         time.sleep(args.interval)
 
 
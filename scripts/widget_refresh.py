@@ -3,14 +3,20 @@ import time
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 ASCII_LAYOUT = list("qwertyuiopasdfghjklzxcvbnm")
+LAYOUT_INDEX = {letter: index for index, letter in enumerate(ASCII_LAYOUT)}
 
 from scripts.configuration import load_widget_settings
 
 
 def load_summary(path: Path) -> Dict[str, Any]:
-    text = path.read_text()
-    return json.loads(text)
+    raw = path.read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 
 def apply_sample_adjustments(
@@ -38,25 +44,18 @@ def compute_speed_score(avg_interval_ms: float) -> float:
 
 
 def compute_handshake(summary: Dict[str, Any], threshold: float, speed_ref: float) -> float:
+    # Long jumps across the layout only score while typing is slower than the threshold.
+    if not (speed_ref < threshold or speed_ref == 0):
+        return 0.0
     key_pairs = summary.get("key_pairs", {})
     score = 0
     for src, targets in key_pairs.items():
-        src_index = None
-        if src:
-            c = src[0].lower()
-            if c in ASCII_LAYOUT:
-                src_index = ASCII_LAYOUT.index(c)
+        src_index = LAYOUT_INDEX.get(src[:1].lower())
         if src_index is None:
             continue
         for dst, count in targets.items():
-            dst_index = None
-            if dst:
-                c2 = dst[0].lower()
-                if c2 in ASCII_LAYOUT:
-                    dst_index = ASCII_LAYOUT.index(c2)
-            if dst_index is None:
-                continue
-            if abs(src_index - dst_index) >= 4 and (speed_ref < threshold or speed_ref == 0):
+            dst_index = LAYOUT_INDEX.get(dst[:1].lower())
+            if dst_index is not None and abs(src_index - dst_index) >= 4:
                 score += count
     return float(min(score, 80))
 
@@ -87,14 +86,20 @@ def persist_widget_progress(
     summary_path: Path, progress_path: Path, mode: str = "real"
 ) -> Dict[str, Any]:
     summary = load_summary(summary_path)
+    settings = load_widget_settings()
     if mode == "sample":
-        summary = apply_sample_adjustments(summary)
+        summary = apply_sample_adjustments(summary, settings)
     snapshot = build_snapshot(summary)
-    accuracy_settings = load_widget_settings()
     accuracy_summary = summary.get("word_accuracy", {})
-    target = float(accuracy_settings["accuracy_target"])
+    target = float(settings["accuracy_target"])
     raw_score = float(accuracy_summary.get("score", 0))
     snapshot["wordAccuracyScore"] = _clamp_accuracy_score(raw_score, target)
     snapshot["wordAccuracyTarget"] = target
-    progress_path.write_text(json.dumps(snapshot, indent=2))
+    if orjson is not None:
+        data = orjson.dumps(snapshot)
+    else:
+        data = json.dumps(snapshot, separators=(",", ":")).encode("utf-8")
+    temporary = progress_path.with_suffix(progress_path.suffix + ".tmp")
+    temporary.write_bytes(data)
+    temporary.replace(progress_path)
     return snapshot
@@ -6,6 +6,7 @@ Optional dependency: `wordfreq`. If not installed, a built-in fallback
 dictionary covers the most common words.
 """
 
+import functools
 from typing import Iterable, Optional, Set
 
 try:
@@ -208,6 +209,8 @@ class WordChecker:
             LANGUAGE_FALLBACK_WORDS.get(lang, frozenset()) for lang in self.languages
         )
         self.fallback = frozenset().union(*fallback_sources)
+        # Typed words follow a Zipf curve, so a small per-instance cache absorbs most wordfreq lookups.
+        self._frequent = functools.lru_cache(maxsize=4096)(self._is_frequent)
 
     def is_correct(self, word: str) -> bool:
         normalized = word.lower().strip()
@@ -215,11 +218,14 @@ class WordChecker:
             return False
         if normalized in self.fallback:
             return True
+        return self._frequent(normalized)
+
+    def _is_frequent(self, normalized: str) -> bool:
         for lang in self.languages:
             freq = self._zipf_frequency(normalized, lang)
             if freq is not None and freq >= self.threshold:
                 return True
-        return normalized in self.fallback
+        return False
 
     def _zipf_frequency(self, word: str, lang: str) -> Optional[float]:
         if zipf_frequency is None:
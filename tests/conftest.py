@@ -1,7 +1,15 @@
+import json
 import sys
 import types
 from types import SimpleNamespace
 
+import pytest
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 try:
     import pynput  # noqa: F401
 except ImportError:
@@ -56,3 +64,23 @@ except ImportError:
     pynput_stub = types.SimpleNamespace(keyboard=keyboard_mod)
     sys.modules["pynput"] = pynput_stub
     sys.modules["pynput.keyboard"] = keyboard_mod
+
+
+@pytest.fixture
+def read_json():
+    def _read(path):
+        raw = path.read_bytes()
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+    return _read
+
+
+@pytest.fixture
+def write_json():
+    def _write(path, payload):
+        if orjson is not None:
+            path.write_bytes(orjson.dumps(payload))
+        else:
+            path.write_text(json.dumps(payload))
+
+    return _write
@@ -1,10 +1,9 @@
 import json
 from pathlib import Path
 
-import pytest
-
 from scripts.configuration import (
     DEFAULT_WIDGET_CONFIG,
+    clear_config_cache,
     load_app_config,
     load_widget_settings,
     resolve_root,
@@ -43,3 +42,16 @@ def test_widget_paths_respects_config(tmp_path: Path, monkeypatch):
     settings = load_widget_settings(config=config)
     assert settings["accuracy_target"] == 88.0
     assert settings["sample_total_ratio"] == 0.05
+
+
+def test_load_app_config_is_cached_until_file_changes(tmp_path: Path):
+    clear_config_cache()
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    config_file = config_dir / "app.json"
+    config_file.write_text(json.dumps({"widget": {"sample_window_days": 7}}))
+    first = load_app_config(tmp_path)
+    assert load_app_config(tmp_path) is first
+
+    config_file.write_text(json.dumps({"widget": {"sample_window_days": 30}}))
+    assert load_app_config(tmp_path)["widget"]["sample_window_days"] == 30
@@ -1,11 +1,15 @@
 import json
+import os
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
+import gpt_insights
 from gpt_insights import (
     adjacency_summary,
     fallback_analysis,
+    fastest_words,
     highlight_rage_day,
     highlight_word_day,
     keyboard_age_from_speed,
@@ -13,48 +17,52 @@ from gpt_insights import (
     summarize_word_shapes,
     summarize_key_holds,
     transition_summary,
+    typing_profile,
+    write_insight,
 )
 
 
 SAMPLE_SUMMARY = Path("data/sample_summary.json")
 
 
-def load_sample_summary():
+@pytest.fixture(scope="module")
+def sample_summary():
+    # Parsed once for the module; the helpers under test only read from it.
     return load_json(SAMPLE_SUMMARY)
 
 
-def test_highlight_rage_day_returns_peak():
-    summary = load_sample_summary()
+def test_highlight_rage_day_returns_peak(sample_summary):
+    summary = sample_summary
     peak = highlight_rage_day(summary)
     assert peak is not None, "Expected a rage peak entry when daily_rage has data"
     assert isinstance(peak[0], str)
     assert isinstance(peak[1], int)
 
 
-def test_highlight_word_day_returns_feast():
-    summary = load_sample_summary()
+def test_highlight_word_day_returns_feast(sample_summary):
+    summary = sample_summary
     feast = highlight_word_day(summary)
     assert feast is not None, "Expected a word feast record from daily_word_counts"
     assert feast["topWord"] is not None
     assert feast["total"] == sum(summary["daily_word_counts"][feast["date"]].values())
 
 
-def test_fallback_analysis_mentions_sample_mode():
-    summary = load_sample_summary()
+def test_fallback_analysis_mentions_sample_mode(sample_summary):
+    summary = sample_summary
     analysis = fallback_analysis(summary, sample_mode=True)
     assert "Offline sample" in analysis
     assert "Keyboard age" in analysis
     assert "Top words" in analysis
 
 
-def test_sample_data_has_expected_keys():
-    summary = load_sample_summary()
+def test_sample_data_has_expected_keys(sample_summary):
+    summary = sample_summary
     keys = {"total_events", "daily_rage", "daily_word_counts"}
     assert keys.issubset(summary.keys())
 
 
-def test_typing_profile_summary_present():
-    summary = load_sample_summary()
+def test_typing_profile_summary_present(sample_summary):
+    summary = sample_summary
     profile = summary.get("typing_profile")
     assert profile
     assert profile["avg_interval"] > 0
@@ -62,8 +70,8 @@ def test_typing_profile_summary_present():
     assert profile["wpm"] > 0
 
 
-def test_word_shapes_have_durations():
-    summary = load_sample_summary()
+def test_word_shapes_have_durations(sample_summary):
+    summary = sample_summary
     shapes = summary.get("word_shapes", {})
     assert shapes
     for word, records in shapes.items():
@@ -73,37 +81,195 @@ def test_word_shapes_have_durations():
             assert all(isinstance(length, int) for length in record["durations"])
 
 
-def test_keyboard_age_from_speed_bounds():
-    summary = load_sample_summary()
+def test_keyboard_age_from_speed_bounds(sample_summary):
+    summary = sample_summary
     age = keyboard_age_from_speed(summary)
     assert 0.5 <= age <= 12
 
 
-def test_transition_summary_contains_arrows():
-    summary = load_sample_summary()
+def test_transition_summary_contains_arrows(sample_summary):
+    summary = sample_summary
     transitions = transition_summary(summary, limit=3)
     assert transitions
     assert all("->" in item for item in transitions)
 
 
-def test_adjacency_summary_produces_pairs():
-    summary = load_sample_summary()
+def test_adjacency_summary_produces_pairs(sample_summary):
+    summary = sample_summary
     adjacency = adjacency_summary(summary, limit=3)
     assert adjacency
     assert all("->" in item for item in adjacency)
 
 
-def test_summarize_word_shapes_returns_notes():
-    summary = load_sample_summary()
+def test_summarize_word_shapes_returns_notes(sample_summary):
+    summary = sample_summary
     notes = summarize_word_shapes(summary, limit=2)
     assert isinstance(notes, list)
     assert any("avg hold" in note for note in notes)
 
 
-def test_summarize_key_holds_returns_sorted_rows():
-    summary = load_sample_summary()
+def test_summarize_key_holds_returns_sorted_rows(sample_summary):
+    summary = sample_summary
     holds = summarize_key_holds(summary, limit=3)
     assert len(holds) <= 3
     assert all(len(entry) == 3 for entry in holds)
     if len(holds) > 1:
         assert all(holds[i][1] >= holds[i + 1][1] for i in range(len(holds) - 1))
+
+
+def test_duration_helpers_tolerate_partial_stats():
+    summary = {
+        "word_durations": {"flow": {"count": 2, "total_ms": 300}, "gap": {}},
+        "key_press_lengths": {"a": {"count": 2, "total_ms": 80}, "b": {"total_ms": 10}},
+    }
+    assert fastest_words(summary) == [("flow", 150)]
+    assert summarize_key_holds(summary) == [("a", 40.0, 2)]
+    assert typing_profile(summary)["avg_press_length"] == 45.0
+
+
+def test_write_insight_round_trips(tmp_path: Path):
+    output = tmp_path / "insight.json"
+    structured = {"analysis_text": "Café rhythm", "insights": [{"tag": "Tempo", "title": "t", "body": "b"}]}
+    write_insight("Café rhythm", structured, output)
+    payload = load_json(output)
+    assert payload["analysis_text"] == "Café rhythm"
+    assert payload["structured"] == structured
+    assert "Café" in output.read_text(encoding="utf-8")
+
+
+def test_summarize_word_shapes_matches_without_numpy(monkeypatch):
+    records = [{"durations": [100 + idx, 200, None, 50][: 1 + idx % 4]} for idx in range(12)]
+    summary = {"word_counts": {"flow": 12}, "word_shapes": {"flow": records}}
+    with_numpy = summarize_word_shapes(summary)
+    monkeypatch.setattr("gpt_insights._load_numpy", lambda: None)
+    assert summarize_word_shapes(summary) == with_numpy
+    assert with_numpy == ["flow avg hold 89ms across 12 runs"]
+
+
+def test_run_skips_gpt_when_summary_is_unchanged(tmp_path: Path, monkeypatch, sample_summary):
+    summary_path = tmp_path / "summary.json"
+    summary_path.write_text(json.dumps(sample_summary))
+    output = tmp_path / "insight.json"
+    calls = []
+
+    def fake_call(prompt, config, api_key=None):
+        calls.append(prompt)
+        return json.dumps({"analysis_text": "Fresh insight", "insights": []})
+
+    monkeypatch.setenv("KEYBOARD_WRAPPED_ROOT", str(tmp_path))
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(gpt_insights, "call_openai", fake_call)
+    monkeypatch.setattr(
+        "sys.argv", ["gpt_insights.py", "--summary", str(summary_path), "--output", str(output)]
+    )
+
+    gpt_insights.run()
+    gpt_insights.run()
+    assert len(calls) == 1
+    assert load_json(output)["analysis_text"] == "Fresh insight"
+
+    summary_path.write_text(json.dumps(sample_summary, indent=2))
+    gpt_insights.run()
+    assert len(calls) == 1
+
+
+def test_run_keeps_unchanged_fallback_insight(tmp_path: Path, monkeypatch, sample_summary):
+    summary_path = tmp_path / "summary.json"
+    summary_path.write_text(json.dumps(sample_summary))
+    output = tmp_path / "insight.json"
+    builds = []
+    original = gpt_insights.fallback_structured
+
+    def counting_fallback(*args, **kwargs):
+        builds.append(True)
+        return original(*args, **kwargs)
+
+    monkeypatch.setenv("KEYBOARD_WRAPPED_ROOT", str(tmp_path))
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(gpt_insights, "fallback_structured", counting_fallback)
+    argv = ["gpt_insights.py", "--summary", str(summary_path), "--output", str(output)]
+    monkeypatch.setattr("sys.argv", argv + ["--mode", "real"])
+    gpt_insights.run()
+    gpt_insights.run()
+    assert len(builds) == 1
+
+    monkeypatch.setattr("sys.argv", argv + ["--mode", "sample"])
+    gpt_insights.run()
+    assert len(builds) == 2
+    assert "Offline sample" in load_json(output)["analysis_text"]
+
+
+def _install_fake_openai(monkeypatch, replies):
+    created = []
+
+    class FakeCompletions:
+        def create(self, **kwargs):
+            created.append(kwargs)
+            assert kwargs["stream"] is True
+            reply = replies[len(created) - 1]
+            return [
+                SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+                for piece in (reply[:5], reply[5:], None)
+            ]
+
+    class FakeClient:
+        def __init__(self, api_key):
+            self.chat = SimpleNamespace(completions=FakeCompletions())
+
+    fake_sdk = SimpleNamespace(__version__="1.0.0", OpenAI=FakeClient)
+    monkeypatch.setattr(gpt_insights, "load_openai", lambda: fake_sdk)
+    gpt_insights.openai_client.cache_clear()
+    gpt_insights.openai_supports_new_api.cache_clear()
+    return created
+
+
+def _reply(text):
+    return json.dumps({"analysis_text": text, "insights": []})
+
+
+def test_call_openai_reuses_cached_response(tmp_path: Path, monkeypatch):
+    created = _install_fake_openai(monkeypatch, [_reply("reply 1"), _reply("reply 2"), _reply("reply 3")])
+    config = {"gpt": {"api_key": "test-key"}, "data": {"gpt_cache": str(tmp_path / "cache")}}
+
+    assert gpt_insights.call_openai("prompt", config) == _reply("reply 1")
+    assert gpt_insights.call_openai("prompt", config) == _reply("reply 1")
+    assert gpt_insights.call_openai("other prompt", config) == _reply("reply 2")
+    config["gpt"]["cache"] = False
+    assert gpt_insights.call_openai("prompt", config) == _reply("reply 3")
+    assert len(created) == 3
+
+    # A cached reply needs neither the SDK nor a key.
+    monkeypatch.setattr(gpt_insights, "load_openai", lambda: None)
+    config["gpt"] = {}
+    assert gpt_insights.call_openai("other prompt", config) == _reply("reply 2")
+    gpt_insights.openai_client.cache_clear()
+    gpt_insights.openai_supports_new_api.cache_clear()
+
+
+def test_gpt_cache_skips_unparsed_replies_and_evicts(tmp_path: Path, monkeypatch):
+    replies = ["not json", "not json", _reply("a"), _reply("b"), _reply("c"), _reply("d")]
+    created = _install_fake_openai(monkeypatch, replies)
+    monkeypatch.setenv("KEYBOARD_WRAPPED_ROOT", str(tmp_path))
+    monkeypatch.setattr(gpt_insights, "GPT_CACHE_MAX_ENTRIES", 2)
+    config = {"gpt": {"api_key": "test-key"}, "data": {"gpt_cache": "cache"}}
+    cache_dir = tmp_path / "cache"
+
+    assert gpt_insights.call_openai("prompt", config) == "not json"
+    assert gpt_insights.call_openai("prompt", config) == "not json"
+    assert len(created) == 2
+    assert not cache_dir.exists()
+
+    for index, prompt in enumerate(("a", "b", "c")):
+        gpt_insights.call_openai(prompt, config)
+        os.utime(gpt_insights.gpt_cache_path(config, prompt, "gpt-4o-mini", 0.72), (index, index))
+    assert len(list(cache_dir.glob("*.json"))) == 2
+
+    # The oldest entry was evicted; a stale one is refetched.
+    assert not gpt_insights.gpt_cache_path(config, "a", "gpt-4o-mini", 0.72).exists()
+    stale = gpt_insights.gpt_cache_path(config, "b", "gpt-4o-mini", 0.72)
+    assert stale.exists()
+    os.utime(stale, (0, 0))
+    assert gpt_insights.call_openai("b", config) == _reply("d")
+    assert len(created) == 6
+    gpt_insights.openai_client.cache_clear()
+    gpt_insights.openai_supports_new_api.cache_clear()
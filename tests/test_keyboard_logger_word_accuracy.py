@@ -1,22 +1,46 @@
 
 import json
-import os
 from pathlib import Path
 
 import pytest
 from pynput import keyboard
 
-from keyboard_logger import WrappedLogger
+from keyboard_logger import PERSIST_INTERVAL_S, WORD_SHAPE_SAMPLES, WrappedLogger
 
-def make_logger_with_speed_config(tmp_path: Path, speed_config: dict):
-    config_dir = tmp_path / "config"
-    config_dir.mkdir(parents=True)
-    config = {"speed_points": speed_config}
-    (config_dir / "app.json").write_text(json.dumps(config))
-    os.environ["KEYBOARD_WRAPPED_ROOT"] = str(tmp_path)
-    summary = tmp_path / "data" / "summary.json"
-    log_path = tmp_path / "data" / "keystrokes.jsonl"
-    return WrappedLogger(log_path, summary, log_mode=True)
+
+SPEED_CONFIG = {
+    "baseline_interval_ms": 320,
+    "interval_pct_threshold": 90,
+    "accuracy_pct_threshold": 80,
+    "session_interval_gap_ms": 5000,
+    "target_sessions": 5,
+}
+
+
+@pytest.fixture
+def debug_messages(monkeypatch):
+    messages = []
+
+    def fake_debug(msg, _=None):
+        messages.append(msg)
+
+    monkeypatch.setattr("keyboard_logger.append_debug", fake_debug)
+    return messages
+
+
+@pytest.fixture
+def make_logger(tmp_path: Path, monkeypatch):
+    def _make(speed_config: dict) -> WrappedLogger:
+        config_dir = tmp_path / "config"
+        config_dir.mkdir(parents=True)
+        config = {"speed_points": speed_config}
+        (config_dir / "app.json").write_text(json.dumps(config))
+        monkeypatch.setenv("KEYBOARD_WRAPPED_ROOT", str(tmp_path))
+        summary = tmp_path / "data" / "summary.json"
+        log_path = tmp_path / "data" / "keystrokes.jsonl"
+        return WrappedLogger(log_path, summary, log_mode=True)
+
+    return _make
 
 
 class DummyLogger(WrappedLogger):
@@ -30,25 +54,17 @@ class DummyLogger(WrappedLogger):
 
 
 def simulate_word(logger: WrappedLogger, word: str):
-    previous = None
     for char in word:
         key = keyboard.KeyCode.from_char(char)
         logger.on_press(key)
         logger.on_release(key)
-        previous = key
     # press space to finish the word
     logger.on_press(keyboard.Key.space)
 
 
-def test_score_word_updates_summary(tmp_path: Path, monkeypatch):
+def test_score_word_updates_summary(tmp_path: Path, debug_messages):
     log_path = tmp_path / "keystrokes.jsonl"
     summary_path = tmp_path / "summary.json"
-    messages = []
-
-    def fake_debug(msg, _=None):
-        messages.append(msg)
-
-    monkeypatch.setattr("keyboard_logger.append_debug", fake_debug)
     logger = DummyLogger(log_path, summary_path, log_mode=True)
     called = []
     original_finish = logger._finish_word
@@ -63,18 +79,12 @@ def test_score_word_updates_summary(tmp_path: Path, monkeypatch):
     assert called
     assert "have" in logger.scored
     assert logger.summary["word_accuracy"]["correct"] >= 1
-    assert any("Word 'have'" in msg for msg in messages)
+    assert any("Word 'have'" in msg for msg in debug_messages)
 
 
-def test_speed_point_awarded_for_fast_session(tmp_path: Path):
-    speed_config = {
-        "baseline_interval_ms": 320,
-        "interval_pct_threshold": 90,
-        "accuracy_pct_threshold": 80,
-        "session_interval_gap_ms": 5000,
-        "target_sessions": 5,
-    }
-    logger = make_logger_with_speed_config(tmp_path, speed_config)
+def test_speed_point_awarded_for_fast_session(make_logger):
+    speed_config = dict(SPEED_CONFIG)
+    logger = make_logger(speed_config)
     logger._track_session_interval(100)
     logger._track_session_interval(120)
     logger._score_session_word(True)
@@ -89,15 +99,9 @@ def test_speed_point_awarded_for_fast_session(tmp_path: Path):
     assert points["last_avg_interval"] == pytest.approx(110, rel=0.01)
 
 
-def test_speed_point_blocked_when_accuracy_too_low(tmp_path: Path):
-    speed_config = {
-        "baseline_interval_ms": 320,
-        "interval_pct_threshold": 90,
-        "accuracy_pct_threshold": 100,
-        "session_interval_gap_ms": 5000,
-        "target_sessions": 5,
-    }
-    logger = make_logger_with_speed_config(tmp_path, speed_config)
+def test_speed_point_blocked_when_accuracy_too_low(make_logger):
+    speed_config = dict(SPEED_CONFIG, accuracy_pct_threshold=100)
+    logger = make_logger(speed_config)
     logger._track_session_interval(100)
     logger._score_session_word(False)
     logger._score_session_word(True)
@@ -118,15 +122,9 @@ def test_short_words_ignored_for_accuracy(tmp_path: Path):
     assert logger.summary["word_accuracy"]["correct"] == initial
 
 
-def test_speed_points_increment_single_per_session(tmp_path: Path):
-    speed_config = {
-        "baseline_interval_ms": 320,
-        "interval_pct_threshold": 90,
-        "accuracy_pct_threshold": 70,
-        "session_interval_gap_ms": 5000,
-        "target_sessions": 5,
-    }
-    logger = make_logger_with_speed_config(tmp_path, speed_config)
+def test_speed_points_increment_single_per_session(make_logger):
+    speed_config = dict(SPEED_CONFIG, accuracy_pct_threshold=70)
+    logger = make_logger(speed_config)
     logger._track_session_interval(100)
     logger._score_session_word(True)
     logger._commit_speed_session()
@@ -139,25 +137,116 @@ def test_speed_points_increment_single_per_session(tmp_path: Path):
     assert points["sessions"] == 2
 
 
-def test_speed_session_logs_threshold(monkeypatch, tmp_path: Path):
-    speed_config = {
-        "baseline_interval_ms": 320,
-        "interval_pct_threshold": 90,
-        "accuracy_pct_threshold": 70,
-        "session_interval_gap_ms": 5000,
-        "target_sessions": 3,
-    }
-    messages = []
-
-    def fake_debug(msg, _=None):
-        messages.append(msg)
-
+def test_speed_session_logs_threshold(monkeypatch, tmp_path: Path, make_logger, debug_messages):
+    speed_config = dict(SPEED_CONFIG, accuracy_pct_threshold=70, target_sessions=3)
     monkeypatch.setenv("KEYBOARD_WRAPPED_ROOT", str(tmp_path))
-    monkeypatch.setattr("keyboard_logger.append_debug", fake_debug)
-    logger = make_logger_with_speed_config(tmp_path, speed_config)
+    logger = make_logger(speed_config)
     logger._track_session_interval(150)
     logger._score_session_word(True)
     logger._score_session_word(True)
     logger._commit_speed_session()
-    assert any("Speed session" in msg for msg in messages)
-    assert any("accuracy threshold" in msg for msg in messages)
+    logged = "\n".join(debug_messages)
+    assert "Speed session" in logged
+    assert "accuracy threshold" in logged
+
+
+def test_summary_persist_is_debounced_until_stop(tmp_path: Path, debug_messages):
+    summary_path = tmp_path / "summary.json"
+    logger = WrappedLogger(tmp_path / "keystrokes.jsonl", summary_path)
+    event = {
+        "timestamp": "2025-01-01T00:00:00+00:00",
+        "key": "a",
+        "category": "letter",
+        "interval_ms": 25,
+        "behaviors": {},
+        "duration_ms": 30,
+    }
+    logger._update_summary(dict(event))
+    logger._update_summary(dict(event))
+    assert json.loads(summary_path.read_text())["total_events"] == 1
+
+    logger.stop()
+    assert json.loads(summary_path.read_text())["total_events"] == 2
+    logger.stop()
+    assert len(debug_messages) == 2
+
+
+def test_autosave_persists_idle_tail(tmp_path: Path, debug_messages):
+    summary_path = tmp_path / "summary.json"
+    logger = WrappedLogger(tmp_path / "keystrokes.jsonl", summary_path)
+    event = {
+        "timestamp": "2025-01-01T00:00:00+00:00",
+        "key": "a",
+        "category": "letter",
+        "interval_ms": 25,
+        "behaviors": {},
+        "duration_ms": 30,
+    }
+    logger._update_summary(dict(event))
+    logger._update_summary(dict(event))
+    logger.autosave()
+    assert json.loads(summary_path.read_text())["total_events"] == 1
+
+    logger.last_persist -= PERSIST_INTERVAL_S
+    logger.autosave()
+    assert json.loads(summary_path.read_text())["total_events"] == 2
+    logger.stop()
+
+
+def test_autosave_flushes_buffered_events(tmp_path: Path, debug_messages):
+    log_path = tmp_path / "keystrokes.jsonl"
+    logger = WrappedLogger(log_path, tmp_path / "summary.json")
+    event = {
+        "timestamp": "2025-01-01T00:00:00+00:00",
+        "key": "a",
+        "category": "letter",
+        "interval_ms": 25,
+        "behaviors": {},
+        "duration_ms": 30,
+    }
+    logger._write_event(dict(event))
+    assert log_path.read_bytes() == b""
+
+    logger.autosave()
+    assert json.loads(log_path.read_text())["key"] == "a"
+    assert logger.unflushed_events == 0
+    logger.stop()
+
+
+def test_word_shapes_are_capped_per_word(tmp_path: Path, debug_messages):
+    logger = WrappedLogger(tmp_path / "keystrokes.jsonl", tmp_path / "summary.json")
+    for _ in range(WORD_SHAPE_SAMPLES + 10):
+        logger.word_buffer = list("flow")
+        logger.word_start, logger.word_last = 0, 200_000_000
+        logger.letter_durations = [40] * 4
+        logger.letter_intervals = [50] * 4
+        logger._finish_word(day_label="2025-01-01", score_word=False)
+
+    assert logger.summary["word_durations"]["flow"]["count"] == WORD_SHAPE_SAMPLES + 10
+    assert len(logger.summary["word_shapes"]["flow"]) == WORD_SHAPE_SAMPLES
+    assert logger.word_shape_samples == WORD_SHAPE_SAMPLES
+
+
+def test_uncapped_word_shapes_are_trimmed_on_load(tmp_path: Path, debug_messages):
+    summary_path = tmp_path / "summary.json"
+    records = [{"durations": [40 + index], "intervals": [50]} for index in range(WORD_SHAPE_SAMPLES + 8)]
+    WrappedLogger(tmp_path / "keystrokes.jsonl", summary_path).stop()
+    saved = json.loads(summary_path.read_text())
+    saved["word_shapes"] = {"flow": records, "tap": records[:3]}
+    summary_path.write_text(json.dumps(saved))
+
+    logger = WrappedLogger(tmp_path / "keystrokes.jsonl", summary_path)
+    shapes = logger.summary["word_shapes"]
+    assert len(shapes["flow"]) == WORD_SHAPE_SAMPLES
+    assert all(record in records for record in shapes["flow"])
+    assert len(shapes["tap"]) == 3
+    assert logger.word_shape_samples == WORD_SHAPE_SAMPLES + 3
+    logger.stop()
+    assert len(json.loads(summary_path.read_text())["word_shapes"]["flow"]) == WORD_SHAPE_SAMPLES
+
+
+def test_stop_without_events_writes_empty_profile(tmp_path: Path, debug_messages):
+    summary_path = tmp_path / "summary.json"
+    logger = WrappedLogger(tmp_path / "keystrokes.jsonl", summary_path)
+    logger.stop()
+    assert json.loads(summary_path.read_text())["typing_profile"]["long_pause_rate"] == 0
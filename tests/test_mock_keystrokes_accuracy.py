@@ -1,7 +1,13 @@
 import json
 from pathlib import Path
 
-from scripts.mock_keystrokes import inject_keys
+from scripts.mock_keystrokes import (
+    _default_summary,
+    inject_keys,
+    load_summary,
+    record_event,
+    record_events,
+)
 
 
 def test_mock_keystrokes_logs_scored_words(tmp_path: Path):
@@ -22,3 +28,31 @@ def test_mock_keystrokes_logs_scored_words(tmp_path: Path):
     assert "Word 'heythere' earned" in log_text
     data = json.loads(summary_path.read_text())
     assert data["word_accuracy"]["incorrect"] >= 1
+
+
+def test_press_totals_resume_from_saved_summary(tmp_path: Path):
+    summary_path = tmp_path / "summary.json"
+    keystroke_log = tmp_path / "keystrokes.jsonl"
+    inject_keys(list("ab"), summary_path, keystroke_log, tmp_path / "widget_debug.log", duration_ms=40)
+
+    saved = json.loads(summary_path.read_text())
+    assert "_press_total_ms" not in saved["typing_profile"]
+    assert saved["typing_profile"]["avg_press_length"] == 40
+
+    summary = load_summary(summary_path)
+    record_event(summary, "c", 120, 100)
+    assert summary["typing_profile"]["_press_total_count"] == 3
+    assert summary["typing_profile"]["avg_press_length"] == 60
+
+
+def test_record_events_matches_per_key_profile():
+    one_by_one, batched = _default_summary(), _default_summary()
+    previous = None
+    for key in "abba":
+        record_event(one_by_one, key, 150, 45, timestamp=1.0, previous_key=previous)
+        previous = key
+    events = record_events(batched, "abba", 150, 45)
+
+    assert [event["key"] for event in events] == list("abba")
+    assert batched["typing_profile"] == one_by_one["typing_profile"]
+    assert batched["key_pairs"] == one_by_one["key_pairs"]
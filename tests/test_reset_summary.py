@@ -3,7 +3,7 @@ from pathlib import Path
 import json
 
 from keyboard_logger import WrappedLogger
-from scripts.reset_summary import reset_daily, reset_widget_progress
+from scripts.reset_summary import _fresh_summary, reset_daily, reset_widget_progress
 
 
 def test_reset_summary(tmp_path: Path):
@@ -57,7 +57,14 @@ def test_reset_widget_progress(tmp_path: Path):
     assert payload["timestamp"] > 0
 
 
-def test_logger_can_write_after_reset(tmp_path: Path):
+def test_reset_daily_builds_fresh_nested_defaults():
+    first, second = _fresh_summary(), _fresh_summary()
+    first["typing_profile"]["wpm"] = 90
+    assert second["typing_profile"]["wpm"] == 0
+
+
+def test_logger_can_write_after_reset(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("KEYBOARD_WRAPPED_ROOT", str(tmp_path))
     summary = tmp_path / "data" / "summary.json"
     log_path = tmp_path / "data" / "keystrokes.jsonl"
     reset_daily(summary)
@@ -1,9 +1,15 @@
 import json
 from pathlib import Path
 
+import pytest
 
-def test_story_grid_has_horizontal_scroll():
-    css = Path("ui/styles.css").read_text()
+
+@pytest.fixture(scope="module")
+def css():
+    return Path("ui/styles.css").read_text()
+
+
+def test_story_grid_has_horizontal_scroll(css):
     assert "story-grid" in css
     assert "overflow-x: auto" in css
     assert "flex-wrap: nowrap" in css
@@ -14,14 +20,12 @@ def test_story_grid_has_horizontal_scroll():
     assert "padding: 1.25rem 0 1rem" in css
 
 
-def test_story_cards_are_tall():
-    css = Path("ui/styles.css").read_text()
+def test_story_cards_are_tall(css):
     assert "min-height: 360px" in css
     assert "padding: 1.6rem" in css
 
 
-def test_story_card_width_is_configurable():
-    css = Path("ui/styles.css").read_text()
+def test_story_card_width_is_configurable(css):
     assert "--story-card-width" in css
     assert "min-width: var(--story-card-width" in css
 
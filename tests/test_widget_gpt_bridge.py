@@ -6,19 +6,16 @@ import pytest
 from scripts import widget_gpt
 
 
-def _make_paths(tmp_path: Path):
+@pytest.fixture
+def widget_gpt_paths(tmp_path: Path):
     data_dir = tmp_path / "data"
     data_dir.mkdir(parents=True)
     feed_path = data_dir / "widget_gpt_feed.json"
     state_path = data_dir / "widget_gpt_state.json"
     progress_path = data_dir / "widget_progress.json"
     debug_path = data_dir / "widget_debug.log"
-    debug_path.write_text("")
-    return progress_path, feed_path, state_path, debug_path
-
-
-def _write_progress(path: Path):
-    path.write_text(
+    debug_path.touch()
+    progress_path.write_text(
         json.dumps(
             {
                 "timestamp": 0,
@@ -28,11 +25,11 @@ def _write_progress(path: Path):
             }
         )
     )
+    return progress_path, feed_path, state_path, debug_path
 
 
-def test_widget_gpt_bridge_dry_run(tmp_path: Path):
-    progress_path, feed_path, state_path, debug_path = _make_paths(tmp_path)
-    _write_progress(progress_path)
+def test_widget_gpt_bridge_dry_run(tmp_path: Path, widget_gpt_paths):
+    progress_path, feed_path, state_path, debug_path = widget_gpt_paths
 
     widget_gpt.main(
         [
@@ -59,9 +56,8 @@ def test_widget_gpt_bridge_dry_run(tmp_path: Path):
     assert debug_path.exists()
 
 
-def test_widget_gpt_bridge_logs_prompt_and_response(tmp_path: Path, monkeypatch):
-    progress_path, feed_path, state_path, debug_path = _make_paths(tmp_path)
-    _write_progress(progress_path)
+def test_widget_gpt_bridge_logs_prompt_and_response(tmp_path: Path, monkeypatch, widget_gpt_paths):
+    progress_path, feed_path, state_path, debug_path = widget_gpt_paths
 
     response_text = "Fresh insight!"
 
@@ -90,9 +86,8 @@ def test_widget_gpt_bridge_logs_prompt_and_response(tmp_path: Path, monkeypatch)
     assert "GPT response (iteration 1, mode real)" in log_content
 
 
-def test_widget_gpt_bridge_logs_error_and_fallback(tmp_path: Path, monkeypatch):
-    progress_path, feed_path, state_path, debug_path = _make_paths(tmp_path)
-    _write_progress(progress_path)
+def test_widget_gpt_bridge_logs_error_and_fallback(tmp_path: Path, monkeypatch, widget_gpt_paths):
+    progress_path, feed_path, state_path, debug_path = widget_gpt_paths
 
     def failing_call(prompt, config):
         raise RuntimeError("boom")
@@ -117,3 +112,72 @@ def test_widget_gpt_bridge_logs_error_and_fallback(tmp_path: Path, monkeypatch):
     log_content = debug_path.read_text()
     assert "GPT prompt (mode real, iteration 1)" in log_content
     assert "GPT request error (iteration 1, mode real)" in log_content
+
+
+def test_widget_gpt_bridge_skips_unchanged_snapshot(tmp_path: Path, monkeypatch, widget_gpt_paths):
+    progress_path, feed_path, state_path, debug_path = widget_gpt_paths
+    calls = []
+
+    def fake_call(prompt, config):
+        calls.append(prompt)
+        return "Fresh insight!"
+
+    monkeypatch.setattr(widget_gpt, "call_openai", fake_call)
+    args = (progress_path, feed_path, state_path, debug_path, {}, "real")
+
+    assert widget_gpt.run_cycle(*args, dry_run=False) is True
+    assert widget_gpt.run_cycle(*args, dry_run=False) is False
+    # Re-indenting the file changes its bytes but not the snapshot itself.
+    progress_path.write_text(json.dumps(json.loads(progress_path.read_text()), indent=2))
+    assert widget_gpt.run_cycle(*args, dry_run=False) is False
+    # Real writers restamp the snapshot on every refresh, even when no ring moved.
+    progress_path.write_text(json.dumps(dict(json.loads(progress_path.read_text()), timestamp=1234)))
+    assert widget_gpt.run_cycle(*args, dry_run=False) is False
+    assert len(calls) == 1
+    assert json.loads(state_path.read_text())["iteration"] == 1
+
+
+def test_widget_gpt_bridge_reuses_reply_for_unchanged_prompt(tmp_path: Path, monkeypatch, widget_gpt_paths):
+    progress_path, feed_path, state_path, debug_path = widget_gpt_paths
+    calls = []
+
+    def fake_call(prompt, config):
+        calls.append(prompt)
+        return f"Insight {len(calls)}"
+
+    monkeypatch.setattr(widget_gpt, "call_openai", fake_call)
+    args = (progress_path, feed_path, state_path, debug_path, {}, "real")
+    progress = json.loads(progress_path.read_text())
+
+    assert widget_gpt.run_cycle(*args, dry_run=False) is True
+    # Idle refreshes bring a fresh timestamp and sub-point drift that the prompt rounds away.
+    for timestamp, handshake in ((1, 18.2), (2, 18.4)):
+        progress_path.write_text(json.dumps(dict(progress, timestamp=timestamp, handshakeProgress=handshake)))
+        assert widget_gpt.run_cycle(*args, dry_run=False) is True
+    assert len(calls) == 2
+    assert calls[1].count("steady rhythm") == 2
+    assert json.loads(feed_path.read_text())["analysis_text"] == "Insight 2"
+    assert "reusing last reply" in debug_path.read_text()
+
+    progress_path.write_text(json.dumps(dict(progress, keyProgress=260)))
+    assert widget_gpt.run_cycle(*args, dry_run=False) is True
+    assert len(calls) == 3
+    assert json.loads(feed_path.read_text())["analysis_text"] == "Insight 3"
+
+
+def test_widget_gpt_loop_waits_for_progress_rewrite(tmp_path: Path, monkeypatch, widget_gpt_paths):
+    progress_path, _, _, _ = widget_gpt_paths
+    cycles = []
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 3:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(widget_gpt, "run_cycle", lambda *args: cycles.append(args) or True)
+    monkeypatch.setattr(widget_gpt.time, "sleep", fake_sleep)
+    with pytest.raises(KeyboardInterrupt):
+        widget_gpt.main(["--root", str(tmp_path), "--dry-run"])
+
+    assert len(cycles) == 1
@@ -1,6 +1,5 @@
 from pathlib import Path
 
-import json
 import pytest
 
 from scripts import widget_refresh
@@ -14,7 +13,7 @@ def sample_summary(tmp_path: Path) -> Path:
     return dest
 
 
-def test_persist_widget_progress_updates(tmp_path: Path, sample_summary: Path):
+def test_persist_widget_progress_updates(tmp_path: Path, sample_summary: Path, read_json, write_json):
     output = tmp_path / "widget_progress.json"
     original_snapshot = widget_refresh.persist_widget_progress(sample_summary, output)
 
@@ -22,10 +21,10 @@ def test_persist_widget_progress_updates(tmp_path: Path, sample_summary: Path):
     assert isinstance(original_snapshot["keyProgress"], float)
     assert output.read_text()
 
-    summary_data = json.loads(sample_summary.read_text())
+    summary_data = read_json(sample_summary)
     summary_data["total_events"] = 9999
     summary_data["typing_profile"]["avg_interval"] = 190
-    sample_summary.write_text(json.dumps(summary_data))
+    write_json(sample_summary, summary_data)
 
     orig_mtime = output.stat().st_mtime
     updated_snapshot = widget_refresh.persist_widget_progress(sample_summary, output)
@@ -52,16 +51,16 @@ def test_sample_adjustment_scales_down():
     assert adjusted["typing_profile"]["avg_interval"] == 150
 
 
-def test_accuracy_score_is_clamped(tmp_path: Path, sample_summary: Path):
+def test_accuracy_score_is_clamped(tmp_path: Path, sample_summary: Path, read_json, write_json):
     output = tmp_path / "widget_progress.json"
-    summary_data = json.loads(sample_summary.read_text())
+    summary_data = read_json(sample_summary)
     summary_data.setdefault("word_accuracy", {})["score"] = -42
-    sample_summary.write_text(json.dumps(summary_data))
+    write_json(sample_summary, summary_data)
     over_score = widget_refresh.persist_widget_progress(sample_summary, output)
     assert over_score["wordAccuracyScore"] == 0
 
     target = widget_refresh.load_widget_settings()["accuracy_target"]
     summary_data["word_accuracy"]["score"] = target + 45
-    sample_summary.write_text(json.dumps(summary_data))
+    write_json(sample_summary, summary_data)
     high_score = widget_refresh.persist_widget_progress(sample_summary, output)
     assert high_score["wordAccuracyScore"] == pytest.approx(target)
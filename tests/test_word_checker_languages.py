@@ -12,3 +12,19 @@ def test_mixed_language_checker_supports_both():
     assert checker.is_correct("the")
     assert checker.is_correct("שיר")
     assert not checker.is_correct("שכחתי_היער")  # unreachable word to make sure fallback doesn't overmatch
+
+
+def test_frequency_lookups_are_cached(monkeypatch):
+    calls = []
+
+    def fake_zipf(word, lang):
+        calls.append(word)
+        return 5.0 if word == "zebra" else 0.0
+
+    monkeypatch.setattr("scripts.word_checker.zipf_frequency", fake_zipf)
+    checker = WordChecker(languages=["en"])
+    assert checker.is_correct("Zebra")
+    assert checker.is_correct("zebra ")
+    assert not checker.is_correct("qwzx")
+    assert not checker.is_correct("qwzx")
+    assert calls == ["zebra", "qwzx"]